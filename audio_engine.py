@@ -0,0 +1,283 @@
+import os
+import glob
+import time
+import queue
+import threading
+import logging
+
+from constants import ALERT_SOUND_PRIORITIES, AUDIO_PRIORITY_NORMAL
+
+class NullAudioBackend:
+    name = "null"
+
+    def __init__(self, num_channels=4):
+        self.num_channels = num_channels
+        self.busy_until = [0.0] * num_channels
+        self.played = []
+
+    def load(self, path):
+        return path if os.path.exists(path) else None
+
+    def get_length(self, sound):
+        return 0.0
+
+    def play(self, channel, sound, queued=None):
+        self.played.append((channel, sound, queued))
+        self.busy_until[channel] = time.time() + self.get_length(sound) + (self.get_length(queued) if queued else 0.0)
+
+    def is_busy(self, channel):
+        return time.time() < self.busy_until[channel]
+
+    def stop(self, channel):
+        self.busy_until[channel] = 0.0
+
+    def close(self):
+        pass
+
+
+class PygameAudioBackend:
+    name = "pygame"
+
+    def __init__(self, num_channels=4):
+        import pygame
+
+        self.pygame = pygame
+        pygame.mixer.init()
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), num_channels))
+        pygame.mixer.set_reserved(num_channels)
+        self.num_channels = num_channels
+        self.channels = [pygame.mixer.Channel(i) for i in range(num_channels)]
+
+    def load(self, path):
+        if not os.path.exists(path):
+            return None
+        return self.pygame.mixer.Sound(path)
+
+    def get_length(self, sound):
+        return sound.get_length()
+
+    def play(self, channel, sound, queued=None):
+        self.channels[channel].play(sound)
+        if queued is not None:
+            self.channels[channel].queue(queued)
+
+    def is_busy(self, channel):
+        return self.channels[channel].get_busy()
+
+    def stop(self, channel):
+        self.channels[channel].stop()
+
+    def close(self):
+        self.pygame.mixer.stop()
+
+
+def create_audio_backend(name="pygame", num_channels=4):
+    if name == "null":
+        return NullAudioBackend(num_channels)
+
+    try:
+        return PygameAudioBackend(num_channels)
+    except Exception as e:
+        logging.warning(f"⚠️ 오디오 장치 초기화 실패 - 무음 모드로 전환 ({e})")
+        return NullAudioBackend(num_channels)
+
+
+class AudioEngine:
+    def __init__(self, backend=None, num_priorities=3, poll_interval=0.05, backend_name="pygame"):
+        self.backend = backend if backend is not None else create_audio_backend(backend_name, num_priorities)
+        self.num_priorities = num_priorities
+        self.poll_interval = poll_interval
+        self.sounds = {}
+        self.requests = queue.PriorityQueue()
+        self.pending = set()
+        self.playing = {}
+        self.repeats = {}
+        self.request_seq = 0
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+    def preload(self, paths):
+        loaded = 0
+        for path in paths:
+            if path in self.sounds:
+                continue
+            try:
+                sound = self.backend.load(path)
+            except Exception as e:
+                logging.error(f"사운드 로드 실패: {path} ({e})")
+                sound = None
+            self.sounds[path] = sound
+            if sound is not None:
+                loaded += 1
+        logging.info(f"🔊 사운드 미리 로드: {loaded}개 ({self.backend.name})")
+
+    def preload_folder(self, folder, pattern="*.mp3"):
+        self.preload(sorted(glob.glob(os.path.join(folder, pattern))))
+
+    def _get_sound(self, path):
+        if path is None:
+            return None
+        if path not in self.sounds:
+            self.preload([path])
+        return self.sounds.get(path)
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._audio_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        self.stop_all()
+        self.backend.close()
+
+    def _resolve_priority(self, sound_file, priority):
+        if priority is None:
+            priority = ALERT_SOUND_PRIORITIES.get(os.path.basename(sound_file), AUDIO_PRIORITY_NORMAL)
+        return min(max(priority, 0), self.num_priorities - 1)
+
+    def play(self, sound_file, voice_file=None, priority=None, key=None):
+        priority = self._resolve_priority(sound_file, priority)
+        key = key or sound_file
+
+        with self.lock:
+            return self._enqueue_locked(priority, key, sound_file, voice_file)
+
+    def _enqueue_locked(self, priority, key, sound_file, voice_file):
+        if key in self.pending or key in self.playing.values():
+            return False
+        self.pending.add(key)
+        self.request_seq += 1
+        self.requests.put((priority, self.request_seq, key, sound_file, voice_file))
+        return True
+
+    def start_repeat(self, key, sound_file, interval, voice_file=None, priority=None):
+        with self.lock:
+            if key in self.repeats:
+                return
+            self.repeats[key] = {
+                "sound_file": sound_file,
+                "voice_file": voice_file,
+                "priority": priority,
+                "interval": interval,
+                "next_time": 0.0
+            }
+
+    def _purge_requests_locked(self, key=None):
+        kept = []
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if key is not None and request[2] != key:
+                kept.append(request)
+        for request in kept:
+            self.requests.put(request)
+
+        if key is None:
+            self.pending.clear()
+        else:
+            self.pending.discard(key)
+
+    def stop_repeat(self, key):
+        with self.lock:
+            self.repeats.pop(key, None)
+            self._purge_requests_locked(key)
+            channels = [channel for channel, playing_key in self.playing.items() if playing_key == key]
+            for channel in channels:
+                self.playing.pop(channel, None)
+        for channel in channels:
+            self.backend.stop(channel)
+
+    def stop_all(self):
+        with self.lock:
+            self._purge_requests_locked()
+            self.playing.clear()
+        for channel in range(self.num_priorities):
+            self.backend.stop(channel)
+
+    def _schedule_repeats(self, now):
+        with self.lock:
+            for key, repeat in self.repeats.items():
+                if now < repeat["next_time"]:
+                    continue
+                priority = self._resolve_priority(repeat["sound_file"], repeat["priority"])
+                if self._enqueue_locked(priority, key, repeat["sound_file"], repeat["voice_file"]):
+                    repeat["next_time"] = now + repeat["interval"]
+
+    def _release_finished(self):
+        with self.lock:
+            finished = [channel for channel in self.playing if not self.backend.is_busy(channel)]
+            for channel in finished:
+                self.playing.pop(channel, None)
+
+    def _dispatch(self, priority, key, sound_file, voice_file):
+        with self.lock:
+            if key not in self.pending:
+                return True
+
+        channel = priority
+        if self.backend.is_busy(channel):
+            return False
+
+        sound = self._get_sound(sound_file)
+        voice = self._get_sound(voice_file)
+        if sound is None and voice is None:
+            return True
+
+        for lower in range(priority + 1, self.num_priorities):
+            if self.backend.is_busy(lower):
+                self.backend.stop(lower)
+
+        if voice is not None:
+            self.backend.play(channel, voice, sound)
+        else:
+            self.backend.play(channel, sound)
+
+        with self.lock:
+            self.playing[channel] = key
+        logging.info(f"🔊 알림 재생: {sound_file}")
+        return True
+
+    def _audio_loop(self):
+        while self.running:
+            try:
+                now = time.time()
+                self._release_finished()
+                self._schedule_repeats(now)
+
+                deferred = []
+                while True:
+                    try:
+                        request = self.requests.get_nowait()
+                    except queue.Empty:
+                        break
+
+                    priority, _, key, sound_file, voice_file = request
+                    try:
+                        dispatched = self._dispatch(priority, key, sound_file, voice_file)
+                    except Exception as e:
+                        logging.error(f"알림 재생 실패: {sound_file} ({e})")
+                        dispatched = True
+
+                    if dispatched:
+                        with self.lock:
+                            self.pending.discard(key)
+                    else:
+                        deferred.append(request)
+
+                with self.lock:
+                    for request in deferred:
+                        if request[2] in self.pending:
+                            self.requests.put(request)
+            except Exception as e:
+                logging.error(f"오디오 엔진 오류: {e}")
+
+            time.sleep(self.poll_interval)
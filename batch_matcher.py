@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+
+def _as_channels(image):
+    if image.ndim == 2:
+        return [image.astype(np.float32)]
+    return [image[:, :, c].astype(np.float32) for c in range(image.shape[2])]
+
+
+class BatchTemplateMatcher:
+    def __init__(self, templates, stats=None):
+        self.templates = []
+        self.size_groups = {}
+        self._spectra = {}
+        self._dft_size = None
+
+        for i, template in enumerate(templates):
+            channels = _as_channels(template)
+            template_stats = stats[i] if stats else None
+            if template_stats is not None and len(template_stats["mean"]) == len(channels):
+                zero_mean = [c - m for c, m in zip(channels, template_stats["mean"])]
+                norm = template_stats["norm"]
+            else:
+                zero_mean = [c - c.mean() for c in channels]
+                norm = float(np.sqrt(sum(float((c * c).sum()) for c in zero_mean)))
+            h, w = template.shape[:2]
+            index = len(self.templates)
+            self.templates.append({"channels": zero_mean, "norm": norm, "h": h, "w": w})
+            self.size_groups.setdefault((h, w), []).append(index)
+
+    def __len__(self):
+        return len(self.templates)
+
+    def _template_spectra(self, dft_size):
+        if self._dft_size != dft_size:
+            self._spectra = {}
+            self._dft_size = dft_size
+
+        if not self._spectra:
+            dft_h, dft_w = dft_size
+            for index, template in enumerate(self.templates):
+                spectra = []
+                for channel in template["channels"]:
+                    padded = np.zeros((dft_h, dft_w), dtype=np.float32)
+                    padded[:template["h"], :template["w"]] = channel
+                    spectra.append(cv2.dft(padded))
+                self._spectra[index] = spectra
+        return self._spectra
+
+    def match(self, image):
+        channels = _as_channels(image)
+        image_h, image_w = image.shape[:2]
+        dft_size = (cv2.getOptimalDFTSize(image_h), cv2.getOptimalDFTSize(image_w))
+        template_spectra = self._template_spectra(dft_size)
+
+        image_spectra = []
+        for channel in channels:
+            padded = np.zeros(dft_size, dtype=np.float32)
+            padded[:image_h, :image_w] = channel
+            image_spectra.append(cv2.dft(padded))
+
+        sums = []
+        sq_sums = []
+        for channel in channels:
+            s, sq = cv2.integral2(channel, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+            sums.append(s)
+            sq_sums.append(sq)
+
+        results = [None] * len(self.templates)
+        for (h, w), indices in self.size_groups.items():
+            if h > image_h or w > image_w:
+                continue
+
+            out_h, out_w = image_h - h + 1, image_w - w + 1
+            n = float(h * w)
+            window_var = np.zeros((out_h, out_w), dtype=np.float64)
+            for s, sq in zip(sums, sq_sums):
+                window_sum = s[h:, w:] - s[:out_h, w:] - s[h:, :out_w] + s[:out_h, :out_w]
+                window_sq = sq[h:, w:] - sq[:out_h, w:] - sq[h:, :out_w] + sq[:out_h, :out_w]
+                window_var += window_sq - window_sum * window_sum / n
+            window_norm = np.sqrt(np.maximum(window_var, 0.0))
+
+            for index in indices:
+                template = self.templates[index]
+                spectrum = None
+                for image_spectrum, template_spectrum in zip(image_spectra, template_spectra[index]):
+                    product = cv2.mulSpectrums(image_spectrum, template_spectrum, 0, conjB=True)
+                    spectrum = product if spectrum is None else spectrum + product
+                correlation = cv2.idft(spectrum, flags=cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT)[:out_h, :out_w]
+
+                denominator = window_norm * template["norm"]
+                result = np.zeros((out_h, out_w), dtype=np.float32)
+                np.divide(correlation, denominator, out=result, where=denominator > 1e-3)
+                np.clip(result, -1.0, 1.0, out=result)
+                results[index] = result
+
+        return results
@@ -17,6 +17,8 @@ from buff_system import BuffSystem
 from alert_system import AlertSystem
 from key_controller import KeyController
 from class1_monster_handler import Class1MonsterHandler
+from frame_pacer import RateClock, stage_rates
+from frame_recorder import FrameRecorder
 
 class BotCore:
     def __init__(self, config):
@@ -38,14 +40,11 @@ class BotCore:
         
         self.previous_character_class = None
         
-        self.cached_no_hunt_status = None
-        self.last_yellow_pos = None
-        
-        self.cached_no_teleport_status = None
-        self.last_teleport_check_pos = None
-        
         self.latest_detection = None
+        self.detection_seq = 0
         self.detection_lock = threading.Lock()
+        self.detection_cond = threading.Condition(self.detection_lock)
+        self.main_loop_fps = 100
         
         self.stop_position = None
         self.stop_time = 0
@@ -71,22 +70,28 @@ class BotCore:
         
         minimap_info = self.current_map_config.get("minimap", {})
         self.screen_capture = ScreenCapture(minimap_info)
+        self.frame_recorder = FrameRecorder(self.screen_capture, self.config.get('recorder_config', {}))
         
         input_method = self.config.get('input_method', 'pyautogui')
         self.key_controller = KeyController(input_method)
         
         attack_range = self.config.get('attack_range', {'width': 200, 'height': 50})
         hunting_config = self.config.get('hunting_config', {})
-        self.detector_engine = DetectorEngine(attack_range, hunting_config)
+        detector_config = self.config.get('detector_config', {})
+        self.detector_engine = DetectorEngine(attack_range, hunting_config, detector_config)
         
         character_model_path = self.config.get('character_info', {}).get('model_path')
         monster_model_path = self.get_current_monster_model_path()
         
         if not self.detector_engine.initialize(character_model_path, monster_model_path):
-            logging.error("GPU/TensorRT 초기화 실패. 프로그램을 종료합니다.")
+            logging.error("탐지 엔진 초기화 실패. 프로그램을 종료합니다.")
             import sys
             sys.exit(1)
         
+        self.detector_engine.preload_monster_models(
+            [self.get_monster_model_path(i) for i in range(len(self.map_sequence))]
+        )
+        
         self.scroll_tracker = ScrollTracker()
         self.scroll_tracker.update_map_config(self.current_map_config)
         
@@ -114,14 +119,16 @@ class BotCore:
             self.config.get('hunting_config', {}),
             self
         )
-        self.hunting_system.set_detection_function(self.get_latest_detection)
+        self.hunting_system.set_detection_function(self.get_latest_detection, self.wait_for_detection)
         
         character_info = self.config.get('character_info', {})
         alert_num = character_info.get('alert_audio', 'char/1.mp3').replace('char/', '').replace('.mp3', '')
         self.alert_system = AlertSystem(
             alert_num,
             self.screen_capture,
-            self.detector_engine
+            self.detector_engine,
+            self.frame_recorder,
+            self.config.get('audio_backend', 'pygame')
         )
         
         self.class1_handler = Class1MonsterHandler(self)
@@ -144,8 +151,11 @@ class BotCore:
         return self.detector_engine
     
     def get_current_monster_model_path(self):
-        current_map_idx = self.map_sequence[self.current_map_index % len(self.map_sequence)]
-        map_info = self.maps_data["maps"][current_map_idx - 1]
+        return self.get_monster_model_path(self.current_map_index)
+    
+    def get_monster_model_path(self, map_position):
+        map_idx = self.map_sequence[map_position % len(self.map_sequence)]
+        map_info = self.maps_data["maps"][map_idx - 1]
         monster_model_name = map_info.get("monstermodelname", map_info.get("name", "default"))
         
         engine_path = f"maple_models/{monster_model_name}/model/{monster_model_name}_best.engine"
@@ -279,12 +289,6 @@ class BotCore:
         new_monster_model_path = self.get_current_monster_model_path()
         self.detector_engine.update_monster_model(new_monster_model_path)
         
-        self.cached_no_hunt_status = None
-        self.last_yellow_pos = None
-        
-        self.cached_no_teleport_status = None
-        self.last_teleport_check_pos = None
-        
         self.stop_position = None
         self.stop_time = 0
         self.is_auto_moving = False
@@ -311,6 +315,8 @@ class BotCore:
     def start_frame_processor(self):
         def frame_processor():
             frame_count = 0
+            frame_reader = self.screen_capture.subscribe("detector")
+            detector_rate = stage_rates.get("detector")
             while self.running:
                 try:
                     frame_count += 1
@@ -319,8 +325,9 @@ class BotCore:
                         time.sleep(0.1)
                         continue
                         
-                    main_frame = self.screen_capture.get_main_frame()
-                    if main_frame is not None:
+                    frame = frame_reader.wait_next()
+                    if frame is not None:
+                        main_frame = frame.main
                         pressed_keys = self.key_controller.get_pressed_keys()
                         movement_direction = None
                         if 'left' in pressed_keys:
@@ -329,9 +336,14 @@ class BotCore:
                             movement_direction = 'right'
                         
                         detection = self.detector_engine.detect(main_frame, movement_direction)
+                        detector_rate.tick()
                         
-                        with self.detection_lock:
+                        with self.detection_cond:
                             self.latest_detection = detection
+                            self.detection_seq += 1
+                            self.detection_cond.notify_all()
+                        
+                        self.frame_recorder.observe(frame, detection)
                         
                         if detection and detection.get("has_class_1_monster"):
                             with self.class1_flag_lock:
@@ -340,8 +352,6 @@ class BotCore:
                                     logging.info("🚨 클래스1 몬스터 감지 - 플래그 설정")
                             
                             self.alert_queue.put((1, time.time(), {'type': 'class1_monster', 'data': detection}))
-                    
-                    time.sleep(0.016)
                 except Exception as e:
                     logging.error(f"프레임 처리 오류: {e}")
                     import traceback
@@ -406,7 +416,7 @@ class BotCore:
             if not acquired:
                 return None, None
             
-            result = None, self.latest_detection
+            result = self.detection_seq, self.latest_detection
             self.detection_lock.release()
             return result
         except Exception as e:
@@ -415,62 +425,27 @@ class BotCore:
                 self.detection_lock.release()
             return None, None
     
+    def wait_for_detection(self, after_seq, timeout=0.1):
+        with self.detection_cond:
+            return self.detection_cond.wait_for(lambda: self.detection_seq != after_seq, timeout)
+    
     def get_cached_detection(self):
         with self.detection_lock:
             return self.latest_detection
     
     def get_latest_minimap(self):
-        return self.screen_capture.get_minimap()
+        return self.screen_capture.get_minimap(consumer="class1")
     
     def get_latest_main(self):
-        return self.screen_capture.get_main_frame()
+        return self.screen_capture.get_main_frame(consumer="class1")
     
-    def is_in_no_hunt_zone(self, no_hunt_zones):
-        yellow_pos = self.yellow_dot_tracker.get_yellow_dot_position()
-        if not yellow_pos:
-            return False
-        
-        if self.last_yellow_pos == yellow_pos and self.cached_no_hunt_status is not None:
-            return self.cached_no_hunt_status
-        
-        self.last_yellow_pos = yellow_pos
-        
-        x, y = yellow_pos
-        for i, box in enumerate(no_hunt_zones):
-            if len(box) == 4:
-                x1, y1, x2, y2 = box
-                if x1 <= x <= x2 and y1 <= y <= y2:
-                    self.cached_no_hunt_status = True
-                    return True
-        
-        self.cached_no_hunt_status = False
-        return False
+    def is_in_no_hunt_zone(self):
+        region = self.yellow_dot_tracker.get_region_info()
+        return region is not None and region.no_hunt
     
     def is_in_no_teleport_zone(self):
-        yellow_pos = self.yellow_dot_tracker.get_yellow_dot_position()
-        if not yellow_pos:
-            return False
-        
-        if self.last_teleport_check_pos == yellow_pos and self.cached_no_teleport_status is not None:
-            return self.cached_no_teleport_status
-        
-        self.last_teleport_check_pos = yellow_pos
-        
-        no_teleport_zones = self.current_map_config.get('no_teleport_boxes', [])
-        if not no_teleport_zones:
-            self.cached_no_teleport_status = False
-            return False
-        
-        x, y = yellow_pos
-        for box in no_teleport_zones:
-            if len(box) == 4:
-                x1, y1, x2, y2 = box
-                if x1 <= x <= x2 and y1 <= y <= y2:
-                    self.cached_no_teleport_status = True
-                    return True
-        
-        self.cached_no_teleport_status = False
-        return False
+        region = self.yellow_dot_tracker.get_region_info()
+        return region is not None and region.no_teleport
     
     def run(self):
         self.running = True
@@ -483,6 +458,7 @@ class BotCore:
         
         time.sleep(1.0)
         
+        self.frame_recorder.start()
         self.yellow_dot_tracker.start()
         self.alert_system.start()
         self.start_frame_processor()
@@ -518,6 +494,8 @@ class BotCore:
     
     def main_loop(self):
         log_counter = 0
+        clock = RateClock(self.main_loop_fps)
+        main_rate = stage_rates.get("main")
         while self.running:
             if self.paused:
                 time.sleep(0.1)
@@ -525,6 +503,7 @@ class BotCore:
             
             try:
                 log_counter += 1
+                main_rate.tick()
                 
                 if log_counter % 300 == 0:
                     yellow_pos = self.yellow_dot_tracker.get_yellow_dot_position()
@@ -534,14 +513,27 @@ class BotCore:
                         if self.scroll_tracker.scroll_enabled:
                             offset = self.scroll_tracker.get_current_scroll_offset()
                             logging.debug(f"📜 스크롤 오프셋: x={offset['x']:.1f}, y={offset['y']:.1f}")
+                    
+                    drop_stats = self.screen_capture.get_drop_stats()
+                    logging.debug("📊 프레임 드랍: " + ", ".join(
+                        f"{name}={stats['dropped']}/{stats['received'] + stats['dropped']}"
+                        for name, stats in drop_stats.items()
+                    ))
+                    logging.debug(f"⏱️ 스테이지 속도: {stage_rates.format()}")
+                    detector_timings = self.detector_engine.get_timings()["average"]
+                    if detector_timings:
+                        logging.debug("⏱️ 탐지 시간: " + ", ".join(
+                            f"{stage}={ms:.1f}ms" for stage, ms in detector_timings.items()
+                        ))
                 
                 with self.class1_flag_lock:
-                    if self.class1_detected_flag:
-                        time.sleep(0.01)
-                        continue
+                    is_class1_flagged = self.class1_detected_flag
+                if is_class1_flagged:
+                    clock.wait()
+                    continue
                 
                 if self.class1_handler.is_processing_class1:
-                    time.sleep(0.01)
+                    clock.wait()
                     continue
                 
                 current_zone = self.yellow_dot_tracker.get_current_zone()
@@ -555,7 +547,7 @@ class BotCore:
                         self.zone_action_manager.stop_forced_movement()
                     else:
                         self.zone_action_manager.execute_forced_movement_actions()
-                        time.sleep(0.01)
+                        clock.wait()
                         continue
                 
                 if current_zone == 1:
@@ -599,8 +591,7 @@ class BotCore:
                 
                 character_detected = detection and detection.get('character_pos') is not None
                 
-                no_hunt_zones = self.current_map_config.get('no_hunt_boxes', [])
-                is_no_hunt_zone = self.is_in_no_hunt_zone(no_hunt_zones)
+                is_no_hunt_zone = self.is_in_no_hunt_zone()
                 
                 character_class = detection.get('character_class') if detection else None
                 
@@ -684,7 +675,7 @@ class BotCore:
             except Exception as e:
                 logging.error(f"메인 루프 오류: {e}")
             
-            time.sleep(0.01)
+            clock.wait()
     
     def cleanup(self):
         self.running = False
@@ -694,6 +685,7 @@ class BotCore:
         self.screen_capture.stop()
         self.yellow_dot_tracker.stop()
         self.alert_system.stop()
+        self.frame_recorder.stop()
         self.key_controller.release_all_keys()
         
         logging.info("✅ 정리 완료")
\ No newline at end of file
@@ -0,0 +1,73 @@
+import numpy as np
+
+def box_iou(boxes_a, boxes_b):
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)), dtype=np.float32)
+
+    a = boxes_a[:, None, :4]
+    b = boxes_b[None, :, :4]
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-6)
+
+
+class BoxTracker:
+    def __init__(self, iou_threshold=0.3, velocity_smoothing=0.5, max_prediction_time=0.2):
+        self.iou_threshold = iou_threshold
+        self.velocity_smoothing = velocity_smoothing
+        self.max_prediction_time = max_prediction_time
+        self.boxes = np.zeros((0, 6), dtype=np.float32)
+        self.velocities = np.zeros((0, 4), dtype=np.float32)
+        self.timestamp = None
+
+    def reset(self):
+        self.boxes = np.zeros((0, 6), dtype=np.float32)
+        self.velocities = np.zeros((0, 4), dtype=np.float32)
+        self.timestamp = None
+
+    @property
+    def active(self):
+        return self.timestamp is not None
+
+    def update(self, detections, timestamp):
+        if detections is None:
+            detections = np.zeros((0, 6), dtype=np.float32)
+        detections = np.asarray(detections, dtype=np.float32)
+
+        velocities = np.zeros((len(detections), 4), dtype=np.float32)
+
+        if self.timestamp is not None and len(self.boxes) > 0 and len(detections) > 0:
+            dt = timestamp - self.timestamp
+            predicted = self.predict(timestamp)
+            iou = box_iou(predicted, detections)
+
+            same_class = predicted[:, None, 5] == detections[None, :, 5]
+            iou = np.where(same_class, iou, 0.0)
+
+            for _ in range(min(len(predicted), len(detections))):
+                track_idx, det_idx = np.unravel_index(np.argmax(iou), iou.shape)
+                if iou[track_idx, det_idx] < self.iou_threshold:
+                    break
+
+                if dt > 0:
+                    measured = (detections[det_idx, :4] - self.boxes[track_idx, :4]) / dt
+                    velocities[det_idx] = (self.velocity_smoothing * measured +
+                                           (1 - self.velocity_smoothing) * self.velocities[track_idx])
+                iou[track_idx, :] = 0.0
+                iou[:, det_idx] = 0.0
+
+        self.boxes = detections.copy()
+        self.velocities = velocities
+        self.timestamp = timestamp
+
+    def predict(self, timestamp):
+        if self.timestamp is None or len(self.boxes) == 0:
+            return self.boxes.copy()
+
+        dt = min(max(timestamp - self.timestamp, 0.0), self.max_prediction_time)
+        predicted = self.boxes.copy()
+        predicted[:, :4] += self.velocities * dt
+        return predicted
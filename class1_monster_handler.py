@@ -5,8 +5,8 @@ import threading
 import os
 import cv2
 import numpy as np
-import pygetwindow as gw
-import mss
+
+from template_matcher import TemplateMatcher
 
 class Class1MonsterHandler:
     def __init__(self, bot_core=None):
@@ -25,6 +25,11 @@ class Class1MonsterHandler:
         self.class_1_alert_thread = None
         self.class_1_alert_stop_flag = threading.Event()
         
+        self.matcher = TemplateMatcher()
+        self.matcher.add_configured_file("alert.png", "alert.png", "alert")
+        self.matcher.add_configured_file("alert1.png", "alert1.png", "alert1")
+        self.matcher.add_configured_file("accept.png", "accept.png", "accept")
+        
         self.class_1_priority_mode = False
         self.class_1_priority_start_time = None
         self.PRIORITY_MODE_DURATION = 180.0
@@ -168,14 +173,8 @@ class Class1MonsterHandler:
     
     def _find_and_click_alert(self):
         try:
-            wins = gw.getWindowsWithTitle("Mapleland")
-            if not wins:
-                logging.error("❌ Mapleland 창을 찾을 수 없습니다.")
-                return False
-            
-            game_window = wins[0]
-            window_x = game_window.left
-            window_y = game_window.top
+            screen_capture = self.bot_core.screen_capture
+            window_x, window_y = screen_capture.get_window_origin()
             
             alert_files = [
                 ("alert.png", 0.8),
@@ -199,30 +198,23 @@ class Class1MonsterHandler:
                         logging.warning(f"⚠️ {alert_path} 파일 없음")
                         continue
                     
-                    alert_template = cv2.imread(alert_path, cv2.IMREAD_COLOR)
-                    if alert_template is None:
+                    if not self.matcher.has(alert_path):
                         logging.error(f"❌ {alert_path} 로드 실패")
                         continue
                     
-                    with mss.mss() as sct:
-                        monitor = {
-                            "left": game_window.left,
-                            "top": game_window.top,
-                            "width": game_window.width,
-                            "height": game_window.height
-                        }
-                        screenshot = sct.grab(monitor)
-                        screenshot_np = np.array(screenshot)
-                        screenshot_bgr = cv2.cvtColor(screenshot_np, cv2.COLOR_BGRA2BGR)
+                    snapshot = screen_capture.snapshot(newer_than=time.time())
+                    if snapshot is None:
+                        logging.error("❌ 화면 캡처 프레임을 받지 못했습니다.")
+                        continue
+                    screenshot_bgr = snapshot.main
                     
-                    result = cv2.matchTemplate(screenshot_bgr, alert_template, cv2.TM_CCOEFF_NORMED)
-                    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+                    max_val, max_loc = self.matcher.match(screenshot_bgr, alert_path)
                     
                     if max_val >= threshold:
-                        template_h, template_w = alert_template.shape[:2]
+                        template_w, template_h = self.matcher.template_size(alert_path)
                         
-                        abs_x = max_loc[0] + game_window.left
-                        abs_y = max_loc[1] + game_window.top
+                        abs_x = max_loc[0] + window_x
+                        abs_y = max_loc[1] + window_y
                         game_x = max_loc[0]
                         game_y = max_loc[1]
                         
@@ -242,24 +234,23 @@ class Class1MonsterHandler:
                             logging.warning("⚠️ accept.png 파일 없음")
                             return False
                         
-                        accept_template = cv2.imread("accept.png", cv2.IMREAD_COLOR)
-                        if accept_template is None:
+                        if not self.matcher.has("accept.png"):
                             logging.error("❌ accept.png 로드 실패")
                             return False
                         
-                        with mss.mss() as sct:
-                            screenshot2 = sct.grab(monitor)
-                            screenshot2_np = np.array(screenshot2)
-                            screenshot2_bgr = cv2.cvtColor(screenshot2_np, cv2.COLOR_BGRA2BGR)
+                        snapshot2 = screen_capture.snapshot(newer_than=time.time())
+                        if snapshot2 is None:
+                            logging.error("❌ 화면 캡처 프레임을 받지 못했습니다.")
+                            return False
+                        screenshot2_bgr = snapshot2.main
                         
-                        accept_result = cv2.matchTemplate(screenshot2_bgr, accept_template, cv2.TM_CCOEFF_NORMED)
-                        accept_min_val, accept_max_val, accept_min_loc, accept_max_loc = cv2.minMaxLoc(accept_result)
+                        accept_max_val, accept_max_loc = self.matcher.match(screenshot2_bgr, "accept.png")
                         
                         if accept_max_val >= 0.4:
-                            accept_h, accept_w = accept_template.shape[:2]
+                            accept_w, accept_h = self.matcher.template_size("accept.png")
                             
-                            accept_abs_x = accept_max_loc[0] + game_window.left
-                            accept_abs_y = accept_max_loc[1] + game_window.top
+                            accept_abs_x = accept_max_loc[0] + window_x
+                            accept_abs_y = accept_max_loc[1] + window_y
                             accept_game_x = accept_max_loc[0]
                             accept_game_y = accept_max_loc[1]
                             
@@ -351,7 +342,7 @@ class Class1MonsterHandler:
                 elif 'right' in pressed_keys:
                     movement_direction = 'right'
                 
-                results = self.bot_core.detector.detect(main_frame, movement_direction)
+                results = self.bot_core.detector.detect(main_frame, movement_direction, full_frame=True)
             else:
                 logging.error("❌ detector를 찾을 수 없음")
                 return False
@@ -0,0 +1,123 @@
+import os
+import json
+import hashlib
+import threading
+import logging
+import cv2
+import numpy as np
+
+LUT_CACHE_DIR = os.path.join(os.path.expanduser("~"), "MapleRidingBot", "cache")
+
+def _normalize_classes(color_classes):
+    normalized = {}
+    for name, ranges in color_classes.items():
+        if isinstance(ranges, dict):
+            ranges = ranges.get("ranges", [])
+        normalized[name] = [(list(map(int, lower)), list(map(int, upper))) for lower, upper in ranges]
+    return normalized
+
+def _cache_key(color_classes, bits):
+    payload = json.dumps({"classes": color_classes, "bits": bits, "cv2": cv2.__version__}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def _all_colors(bits):
+    levels = 1 << bits
+    step = 256 // levels
+    values = (np.arange(levels, dtype=np.uint16) * step + step // 2).clip(0, 255).astype(np.uint8)
+    r, g, b = np.meshgrid(values, values, values, indexing="ij")
+    colors = np.stack([b.ravel(), g.ravel(), r.ravel()], axis=1)
+    side = 1 << ((3 * bits + 1) // 2)
+    return colors.reshape(side, -1, 3)
+
+def compile_lut(color_classes, bits=8):
+    color_classes = _normalize_classes(color_classes)
+    if len(color_classes) > 16:
+        raise ValueError("색상 클래스는 최대 16개까지 지원합니다")
+
+    dtype = np.uint8 if len(color_classes) <= 8 else np.uint16
+    hsv = cv2.cvtColor(_all_colors(bits), cv2.COLOR_BGR2HSV)
+    lut = np.zeros(hsv.shape[:2], dtype=dtype)
+
+    for index, (name, ranges) in enumerate(color_classes.items()):
+        mask = np.zeros(hsv.shape[:2], dtype=np.uint8)
+        for lower, upper in ranges:
+            cv2.bitwise_or(mask, cv2.inRange(hsv, np.array(lower), np.array(upper)), dst=mask)
+        lut[mask > 0] |= dtype(1 << index)
+
+    return lut.ravel()
+
+
+class ColorLUT:
+    def __init__(self, color_classes, bits=8, cache_dir=LUT_CACHE_DIR):
+        self.color_classes = _normalize_classes(color_classes)
+        self.names = list(self.color_classes.keys())
+        self.bits = bits
+        self.shift = 8 - bits
+        self.cache_dir = cache_dir
+        self.lut = None
+        self.load_lock = threading.Lock()
+
+    def _load_or_compile(self, cache_dir):
+        key = _cache_key(self.color_classes, self.bits)
+        path = os.path.join(cache_dir, f"color_lut_{key}.npy") if cache_dir else None
+
+        if path and os.path.exists(path):
+            try:
+                lut = np.load(path)
+                if lut.size == 1 << (3 * self.bits):
+                    return lut
+            except Exception as e:
+                logging.warning(f"⚠️ 색상 LUT 캐시 로드 실패: {path} ({e})")
+
+        lut = compile_lut(self.color_classes, self.bits)
+        logging.info(f"🎨 색상 LUT 생성: {len(self.names)}개 클래스, {self.bits}비트")
+
+        if path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                np.save(path, lut)
+            except Exception as e:
+                logging.warning(f"⚠️ 색상 LUT 캐시 저장 실패: {path} ({e})")
+        return lut
+
+    def _get_lut(self):
+        if self.lut is None:
+            with self.load_lock:
+                if self.lut is None:
+                    self.lut = self._load_or_compile(self.cache_dir)
+        return self.lut
+
+    def bit(self, name):
+        return 1 << self.names.index(name)
+
+    def classify(self, image):
+        lut = self._get_lut()
+        if not self.shift:
+            bgra = cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+            index = bgra.view(np.uint32)[:, :, 0] & np.uint32(0xFFFFFF)
+            return np.take(lut, index)
+
+        image = image >> self.shift
+        index = image[:, :, 2].astype(np.uint32) << (2 * self.bits)
+        index |= image[:, :, 1].astype(np.uint32) << self.bits
+        index |= image[:, :, 0]
+        return np.take(lut, index)
+
+    def mask(self, labels, name):
+        return ((labels & self.bit(name)) > 0).view(np.uint8) * np.uint8(255)
+
+    def count(self, labels, name):
+        return int(np.count_nonzero(labels & self.bit(name)))
+
+
+_luts = {}
+_luts_lock = threading.Lock()
+
+def get_color_lut(color_classes, bits=8):
+    key = _cache_key(_normalize_classes(color_classes), bits)
+    with _luts_lock:
+        lut = _luts.get(key)
+        if lut is None:
+            lut = ColorLUT(color_classes, bits)
+            _luts[key] = lut
+        return lut
@@ -39,4 +39,54 @@ RIDING_CHECK_ATTEMPTS = 3
 TEMPLATE_MATCH_THRESHOLD = 0.8
 
 ALERT_COOLDOWN = 5.0
-LIE_ALERT_INTERVAL = 3.0
\ No newline at end of file
+LIE_ALERT_INTERVAL = 3.0
+TEMPLATE_PYRAMID_SCALE = 0.25
+TEMPLATE_PYRAMID_TOP_K = 3
+
+TEMPLATE_MATCH_CONFIG = {
+    "change": {"roi": None, "mode": "bgr", "threshold": 0.8, "pyramid": True},
+    "item": {"roi": None, "mode": "bgr", "threshold": 0.8, "pyramid": True},
+    "zero": {"roi": (1700, 1038, 1718, 1062), "mode": "bgr", "threshold": 0.8, "pyramid": False},
+    "alert": {"roi": None, "mode": "bgr", "threshold": 0.8, "pyramid": True},
+    "alert1": {"roi": None, "mode": "bgr", "threshold": 0.9, "pyramid": True},
+    "accept": {"roi": None, "mode": "bgr", "threshold": 0.4, "pyramid": True}
+}
+
+MINIMAP_COLOR_CLASSES = {
+    "yellow": {
+        "ranges": [(YELLOW_DOT_RANGE["lower"], YELLOW_DOT_RANGE["upper"])],
+        "min_area": 0,
+        "max_area": None
+    },
+    "red": {
+        "ranges": [(RED_DOT_RANGE["lower"], RED_DOT_RANGE["upper"]),
+                   (RED_DOT_RANGE["lower2"], RED_DOT_RANGE["upper2"])],
+        "min_area": 4,
+        "max_area": 100
+    }
+}
+
+CHAT_COLOR_CLASSES = {
+    "분홍": [([156, 11, 177], [176, 111, 255])],
+    "파랑": [([95, 0, 173], [115, 98, 255])],
+    "녹색": [([50, 205, 146], [70, 255, 246])],
+    "노랑": [([20, 205, 205], [40, 255, 255])],
+    "회색": [([0, 0, 114], [180, 50, 214])],
+    "흰색": [([0, 0, 205], [180, 50, 255])]
+}
+
+AUDIO_PRIORITY_CRITICAL = 0
+AUDIO_PRIORITY_HIGH = 1
+AUDIO_PRIORITY_NORMAL = 2
+
+ALERT_SOUND_PRIORITIES = {
+    "lie.mp3": AUDIO_PRIORITY_CRITICAL,
+    "alert.mp3": AUDIO_PRIORITY_CRITICAL,
+    "user.mp3": AUDIO_PRIORITY_HIGH,
+    "zero.mp3": AUDIO_PRIORITY_HIGH,
+    "change.mp3": AUDIO_PRIORITY_NORMAL,
+    "item.mp3": AUDIO_PRIORITY_NORMAL,
+    "chat.mp3": AUDIO_PRIORITY_NORMAL
+}
+
+RED_DOT_ALERT_INTERVAL = 10.0
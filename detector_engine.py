@@ -1,12 +1,148 @@
 import torch
+import cv2
 import numpy as np
 import logging
-from ultralytics import YOLO
 import os
 import time
+import threading
+from contextlib import contextmanager
+from collections.abc import Sequence
+
+from box_tracker import BoxTracker
+from inference_backend import load_model, resolve_candidates, model_base_path, DEFAULT_BACKEND_ORDER
+from model_registry import ModelRegistry
+
+MONSTER_DTYPE = np.dtype([
+    ("bbox", np.float32, (4,)),
+    ("center", np.int32, (2,)),
+    ("confidence", np.float32),
+    ("class_id", np.int32),
+    ("in_range", np.bool_),
+    ("direction", np.int8),
+    ("distance", np.float64)
+])
+
+DIRECTION_NAMES = ("left", "right")
+
+def build_monster_table(data, confidence_threshold, character_pos, attack_box):
+    data = data[data[:, 4] >= confidence_threshold]
+    table = np.zeros(len(data), dtype=MONSTER_DTYPE)
+    if len(data) == 0:
+        return table
+    
+    left, top, right, bottom = data[:, 0], data[:, 1], data[:, 2], data[:, 3]
+    center_x = ((left + right) / 2).astype(np.int32)
+    center_y = ((top + bottom) / 2).astype(np.int32)
+    
+    table["bbox"] = data[:, :4]
+    table["center"][:, 0] = center_x
+    table["center"][:, 1] = center_y
+    table["confidence"] = data[:, 4]
+    table["class_id"] = data[:, 5].astype(np.int32) if data.shape[1] > 5 else 0
+    
+    if character_pos is None:
+        return table
+    
+    char_x, char_y = character_pos
+    attack_left, attack_top, attack_right, attack_bottom = attack_box
+    overlaps = ~((right < attack_left) | (left > attack_right) |
+                 (bottom < attack_top) | (top > attack_bottom))
+    distance = np.sqrt((center_x - char_x).astype(np.float64) ** 2 +
+                       (center_y - char_y).astype(np.float64) ** 2)
+    
+    table["distance"] = distance
+    table["direction"] = np.where(center_x < char_x, 0, 1)
+    table["in_range"] = overlaps & (distance > 20)
+    return table
+
+
+class MonsterListView(Sequence):
+    def __init__(self, table, in_range_form=False):
+        self.table = table
+        self.in_range_form = in_range_form
+        self._cache = [None] * len(table)
+    
+    def __len__(self):
+        return len(self.table)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        if index < 0:
+            index += len(self)
+        item = self._cache[index]
+        if item is None:
+            item = self._to_dict(self.table[index])
+            self._cache[index] = item
+        return item
+    
+    def _to_dict(self, row):
+        left, top, right, bottom = row["bbox"]
+        center_x, center_y = int(row["center"][0]), int(row["center"][1])
+        
+        if self.in_range_form:
+            return {
+                "bbox": [left, top, right, bottom],
+                "center": (center_x, center_y),
+                "direction": DIRECTION_NAMES[row["direction"]],
+                "distance": float(row["distance"]),
+                "confidence": float(row["confidence"]),
+                "class_id": int(row["class_id"])
+            }
+        
+        return {
+            "bbox": [left, top, right, bottom],
+            "center": [center_x, center_y],
+            "confidence": float(row["confidence"]),
+            "class_id": int(row["class_id"])
+        }
+    
+    def __repr__(self):
+        return repr(list(self))
+
+
+class InferenceGate:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.busy = False
+        self.high_waiting = 0
+    
+    @contextmanager
+    def high(self, on_wait=None):
+        with self.cond:
+            self.high_waiting += 1
+            try:
+                if self.busy and on_wait:
+                    on_wait()
+                self.cond.wait_for(lambda: not self.busy)
+            finally:
+                self.high_waiting -= 1
+            self.busy = True
+        try:
+            yield True
+        finally:
+            with self.cond:
+                self.busy = False
+                self.cond.notify_all()
+    
+    @contextmanager
+    def low(self, timeout=None):
+        with self.cond:
+            acquired = self.cond.wait_for(lambda: not self.busy and self.high_waiting == 0, timeout)
+            if acquired:
+                self.busy = True
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                with self.cond:
+                    self.busy = False
+                    self.cond.notify_all()
+
 
 class DetectorEngine:
-    def __init__(self, attack_range, hunting_config=None):
+    def __init__(self, attack_range, hunting_config=None, detector_config=None):
         self.character_model = None
         self.monster_model = None
         self.lie_model = None
@@ -15,60 +151,76 @@ class DetectorEngine:
         self.last_character_time = 0
         self.attack_range = attack_range
         self.current_monster_model_path = None
+        self.pending_monster_model = None
+        self.model_swap_lock = threading.Lock()
+        self.character_model_path = None
         self.hunting_config = hunting_config or {}
         self.hunting_direction = self.hunting_config.get('hunting_direction', 'movement_only')
         self.monster_confidence = self.hunting_config.get('monster_confidence', 0.25)
+        self.detector_config = detector_config or {}
+        self.shared_preprocess = self.detector_config.get('shared_preprocess', True)
+        self.imgsz = self.detector_config.get('imgsz', 640)
+        self.backends = self.detector_config.get('backends', DEFAULT_BACKEND_ORDER)
+        self.device = 'cuda:0' if torch.cuda.is_available() else 'cpu'
+        self.model_registry = ModelRegistry(
+            lambda path: load_model(path, self.backends, self.imgsz),
+            self.detector_config.get('model_memory_budget_mb', 4096)
+        )
+        self.letterbox_square = True
+        self.roi_inference = self.detector_config.get('roi_inference', False)
+        self.roi_active = self.roi_inference
+        self.roi_margin = self.detector_config.get('roi_margin', 64)
+        self.roi_full_frame_interval = self.detector_config.get('roi_full_frame_interval', 10)
+        self.frames_since_full_frame = self.roi_full_frame_interval
+        self.last_full_frame_class1 = False
+        self.temporal_skip = self.detector_config.get('temporal_skip', False)
+        self.keyframe_interval = self.detector_config.get('keyframe_interval', 3)
+        self.motion_threshold = self.detector_config.get('motion_threshold', 6.0)
+        self.character_tracker = BoxTracker()
+        self.monster_tracker = BoxTracker()
+        self.frames_since_keyframe = 0
+        self.keyframe_thumbnail = None
+        self.last_timings = {}
+        self.average_timings = {}
+        self.inference_gate = InferenceGate()
+        self.lie_stream = None
+        self.lie_confidence = self.detector_config.get('lie_confidence', 0.8)
     
     def initialize(self, character_model_path=None, monster_model_path=None):
-        if not torch.cuda.is_available():
-            logging.error("❌ GPU를 사용할 수 없습니다!")
-            return False
-        
         try:
             if character_model_path:
-                if not os.path.exists(character_model_path) and character_model_path.endswith('.engine'):
-                    pt_path = character_model_path.replace('.engine', '.pt')
-                    if os.path.exists(pt_path):
-                        character_model_path = pt_path
-                        logging.info(f"⚠️ .engine 파일이 없어 .pt 파일 사용: {pt_path}")
-                
-                if os.path.exists(character_model_path):
-                    self.character_model = YOLO(character_model_path, task='detect')
-                    logging.info(f"✅ 캐릭터 모델 로드: {character_model_path}")
-                else:
-                    logging.error(f"❌ 캐릭터 모델 파일을 찾을 수 없습니다: {character_model_path}")
+                self.character_model = load_model(character_model_path, self.backends, self.imgsz)
+                if not self.character_model:
+                    logging.error(f"❌ 캐릭터 모델을 로드할 수 없습니다: {character_model_path}")
                     return False
+                self.character_model_path = self.character_model.path
+                self.device = self.character_model.device
+                logging.info(f"✅ 캐릭터 모델 로드: {self.character_model.path}")
             
             if monster_model_path:
-                if not os.path.exists(monster_model_path) and monster_model_path.endswith('.engine'):
-                    pt_path = monster_model_path.replace('.engine', '.pt')
-                    if os.path.exists(pt_path):
-                        monster_model_path = pt_path
-                        logging.info(f"⚠️ .engine 파일이 없어 .pt 파일 사용: {pt_path}")
-                
-                if os.path.exists(monster_model_path):
-                    self.monster_model = YOLO(monster_model_path, task='detect')
-                    self.current_monster_model_path = monster_model_path
-                    logging.info(f"✅ 몬스터 모델 로드: {monster_model_path}")
-                else:
-                    logging.error(f"❌ 몬스터 모델 파일을 찾을 수 없습니다: {monster_model_path}")
+                self.monster_model = self.model_registry.acquire(monster_model_path, pin=True)
+                if not self.monster_model:
+                    logging.error(f"❌ 몬스터 모델을 로드할 수 없습니다: {monster_model_path}")
                     return False
+                self.current_monster_model_path = self.monster_model.path
+                logging.info(f"✅ 몬스터 모델 로드: {self.monster_model.path}")
             
-            lie_engine = "char_models/lie/model/lie_best.engine"
-            if not os.path.exists(lie_engine):
-                lie_pt = lie_engine.replace('.engine', '.pt')
-                if os.path.exists(lie_pt):
-                    lie_engine = lie_pt
-                    logging.info(f"⚠️ .engine 파일이 없어 .pt 파일 사용: {lie_pt}")
-            
-            if os.path.exists(lie_engine):
-                self.lie_model = YOLO(lie_engine, task='detect')
-                logging.info(f"✅ 거탐 모델 로드: {lie_engine}")
+            lie_path = "char_models/lie/model/lie_best.engine"
+            if resolve_candidates(lie_path, self.backends):
+                self.lie_model = load_model(lie_path, self.backends, self.imgsz)
+                if self.lie_model:
+                    logging.info(f"✅ 거탐 모델 로드: {self.lie_model.path}")
             
-            gpu_name = torch.cuda.get_device_name()
-            logging.info(f"✅ GPU 초기화 성공: {gpu_name}")
+            if torch.cuda.is_available():
+                gpu_name = torch.cuda.get_device_name()
+                logging.info(f"✅ GPU 사용 가능: {gpu_name}")
+                if self.lie_model and self.lie_model.backend == "torch_cuda" and \
+                        self.detector_config.get('lie_cuda_stream', True):
+                    self.lie_stream = torch.cuda.Stream()
+            else:
+                logging.info("⚠️ GPU 없음 - CPU 추론 백엔드 사용")
             
-            self.warmup()
+            self._update_letterbox_mode()
             return True
             
         except Exception as e:
@@ -76,68 +228,298 @@ class DetectorEngine:
             return False
     
     def update_monster_model(self, monster_model_path):
-        if monster_model_path == self.current_monster_model_path:
+        if self.current_monster_model_path and \
+                model_base_path(monster_model_path) == model_base_path(self.current_monster_model_path):
             return True
         
         try:
             if monster_model_path:
-                if not os.path.exists(monster_model_path) and monster_model_path.endswith('.engine'):
-                    pt_path = monster_model_path.replace('.engine', '.pt')
-                    if os.path.exists(pt_path):
-                        monster_model_path = pt_path
-                        logging.info(f"⚠️ .engine 파일이 없어 .pt 파일 사용: {pt_path}")
-                
-                if os.path.exists(monster_model_path):
-                    self.monster_model = YOLO(monster_model_path, task='detect')
-                    self.current_monster_model_path = monster_model_path
-                    logging.info(f"✅ 몬스터 모델 업데이트: {monster_model_path}")
-                    
-                    dummy_image = np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
-                    self.monster_model(dummy_image, device='cuda:0', verbose=False)
+                monster_model = self.model_registry.acquire(monster_model_path, pin=True)
+                if monster_model:
+                    with self.model_swap_lock:
+                        self.pending_monster_model = monster_model
+                        self.current_monster_model_path = monster_model.path
+                    logging.info(f"✅ 몬스터 모델 업데이트: {monster_model.path}")
                     return True
                 else:
-                    logging.error(f"❌ 몬스터 모델 파일을 찾을 수 없습니다: {monster_model_path}")
+                    logging.error(f"❌ 몬스터 모델을 로드할 수 없습니다: {monster_model_path}")
                     return False
         except Exception as e:
             logging.error(f"몬스터 모델 업데이트 실패: {e}")
             return False
     
-    def warmup(self):
-        dummy_image = np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
-        try:
-            if self.character_model:
-                self.character_model(dummy_image, device='cuda:0', verbose=False)
-            if self.monster_model:
-                self.monster_model(dummy_image, device='cuda:0', verbose=False)
-            if self.lie_model:
-                self.lie_model(dummy_image, device='cuda:0', verbose=False)
-            logging.info("✅ GPU 워밍업 완료")
-        except:
-            pass
+    def _apply_pending_monster_model(self):
+        with self.model_swap_lock:
+            monster_model = self.pending_monster_model
+            self.pending_monster_model = None
+        
+        if monster_model is None:
+            return
+        
+        self.monster_model = monster_model
+        self._update_letterbox_mode()
+        self.reset_tracking()
+    
+    def preload_monster_models(self, monster_model_paths):
+        self.model_registry.preload(monster_model_paths)
+    
+    def reset_tracking(self):
+        self.character_tracker.reset()
+        self.monster_tracker.reset()
+        self.keyframe_thumbnail = None
+        self.frames_since_full_frame = self.roi_full_frame_interval
+        self.last_full_frame_class1 = False
+    
+    def _update_letterbox_mode(self):
+        models = [self.character_model, self.monster_model]
+        self.letterbox_square = any(
+            model.static_shape for model in models if model
+        ) or not self.detector_config.get('rect_inference', True)
+        
+        roi_active = self.roi_inference and not self.letterbox_square
+        if self.roi_inference and roi_active != self.roi_active:
+            if roi_active:
+                logging.info("🎯 몬스터 ROI 추론 활성화")
+            else:
+                logging.info("🎯 고정 입력 크기 모델 - ROI 추론 비활성화 (전체 프레임과 입력 크기 동일)")
+        self.roi_active = roi_active
+    
+    def _preprocess(self, frame):
+        frame_h, frame_w = frame.shape[:2]
+        ratio = min(self.imgsz / frame_h, self.imgsz / frame_w)
+        new_w = int(round(frame_w * ratio))
+        new_h = int(round(frame_h * ratio))
+        
+        if self.letterbox_square:
+            canvas_w = canvas_h = self.imgsz
+        else:
+            canvas_w = int(np.ceil(new_w / 32) * 32)
+            canvas_h = int(np.ceil(new_h / 32) * 32)
+        
+        pad_x = (canvas_w - new_w) / 2
+        pad_y = (canvas_h - new_h) / 2
+        left = int(round(pad_x - 0.1))
+        right = int(round(pad_x + 0.1))
+        top = int(round(pad_y - 0.1))
+        bottom = int(round(pad_y + 0.1))
+        
+        if (new_w, new_h) != (frame_w, frame_h):
+            resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        else:
+            resized = frame
+        canvas = cv2.copyMakeBorder(resized, top, bottom, left, right,
+                                    cv2.BORDER_CONSTANT, value=(114, 114, 114))
+        
+        letterbox = {"ratio": ratio, "left": left, "top": top, "width": frame_w, "height": frame_h}
+        return self._to_tensor(canvas), letterbox
     
-    def detect(self, frame, movement_direction=None):
+    def _to_tensor(self, image):
+        tensor = torch.from_numpy(np.ascontiguousarray(image)).to(self.device, non_blocking=True)
+        return tensor[:, :, [2, 1, 0]].permute(2, 0, 1).unsqueeze(0).float().div_(255.0)
+    
+    def _get_monster_roi(self, frame_shape, attack_box):
+        frame_h, frame_w = frame_shape[:2]
+        attack_left, attack_top, attack_right, attack_bottom = attack_box
+        
+        width = attack_right - attack_left + self.roi_margin * 2
+        height = attack_bottom - attack_top + self.roi_margin * 2
+        
+        width = int(np.ceil(width / 32) * 32)
+        height = int(np.ceil(height / 32) * 32)
+        
+        if width >= frame_w or height >= frame_h:
+            return None
+        
+        ratio = min(self.imgsz / frame_h, self.imgsz / frame_w)
+        full_w = np.ceil(frame_w * ratio / 32) * 32
+        full_h = np.ceil(frame_h * ratio / 32) * 32
+        if width * height >= full_w * full_h:
+            return None
+        
+        center_x = (attack_left + attack_right) / 2
+        center_y = (attack_top + attack_bottom) / 2
+        x1 = int(min(max(center_x - width / 2, 0), frame_w - width))
+        y1 = int(min(max(center_y - height / 2, 0), frame_h - height))
+        return (x1, y1, x1 + width, y1 + height)
+    
+    def _detect_monsters_in_roi(self, frame, roi):
+        x1, y1, x2, y2 = roi
+        crop_tensor = self._to_tensor(frame[y1:y2, x1:x2])
+        monster_results = self.monster_model(crop_tensor, verbose=False)
+        
+        frame_h, frame_w = frame.shape[:2]
+        offset = {"ratio": 1.0, "left": -x1, "top": -y1, "width": frame_w, "height": frame_h}
+        return self._get_box_data(monster_results, offset)
+    
+    def _get_box_data(self, results, letterbox):
+        if not results or results[0].boxes is None or len(results[0].boxes) == 0:
+            return None
+        
+        data = results[0].boxes.data.cpu().numpy().astype(np.float32, copy=True)
+        if letterbox is None:
+            return data
+        
+        data[:, [0, 2]] -= letterbox["left"]
+        data[:, [1, 3]] -= letterbox["top"]
+        data[:, :4] /= letterbox["ratio"]
+        data[:, [0, 2]] = np.clip(data[:, [0, 2]], 0, letterbox["width"])
+        data[:, [1, 3]] = np.clip(data[:, [1, 3]], 0, letterbox["height"])
+        return data
+    
+    def _record_timings(self, timings):
+        self.last_timings = timings
+        for key, value in timings.items():
+            previous = self.average_timings.get(key)
+            self.average_timings[key] = value if previous is None else previous * 0.9 + value * 0.1
+    
+    def get_timings(self):
+        return {
+            "last": dict(self.last_timings),
+            "average": dict(self.average_timings)
+        }
+    
+    def _get_attack_box(self, character_pos, movement_direction):
+        char_x, char_y = character_pos
+        
+        attack_width = self.attack_range.get('width', 150)
+        attack_height = self.attack_range.get('height', 50)
+        
+        if self.hunting_direction == 'movement_only' and movement_direction:
+            if movement_direction == 'left':
+                attack_left = char_x - attack_width
+                attack_right = char_x
+            else:
+                attack_left = char_x
+                attack_right = char_x + attack_width
+        else:
+            attack_left = char_x - attack_width
+            attack_right = char_x + attack_width
+        
+        attack_top = char_y - attack_height
+        attack_bottom = char_y + attack_height
+        return (attack_left, attack_top, attack_right, attack_bottom)
+    
+    def _apply_monster_table(self, result, table):
+        in_range = table[table["in_range"]]
+        
+        result["monster_table"] = table
+        result["monsters"] = MonsterListView(table)
+        result["monsters_info"] = MonsterListView(in_range, in_range_form=True)
+        result["has_class_1_monster"] = bool(np.any(table["class_id"] == 1))
+        
+        if len(in_range) > 0:
+            result["monsters_in_range"] = True
+            result["monster_direction"] = DIRECTION_NAMES[in_range["direction"][-1]]
+    
+    def _make_thumbnail(self, frame):
+        frame_h, frame_w = frame.shape[:2]
+        thumbnail = cv2.resize(frame, (max(frame_w // 16, 1), max(frame_h // 16, 1)), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY)
+    
+    def _can_propagate(self, thumbnail):
+        if self.frames_since_keyframe + 1 >= self.keyframe_interval:
+            return False
+        if not self.character_tracker.active or not self.monster_tracker.active:
+            return False
+        if self.keyframe_thumbnail is None or self.keyframe_thumbnail.shape != thumbnail.shape:
+            return False
+        
+        motion_energy = float(cv2.absdiff(thumbnail, self.keyframe_thumbnail).mean())
+        return motion_energy < self.motion_threshold
+    
+    def _update_trackers(self, char_data, monster_data, timestamp):
+        if char_data is None:
+            self.character_tracker.reset()
+            self.monster_tracker.reset()
+            return
+        
+        self.character_tracker.update(char_data[:1], timestamp)
+        if monster_data is None:
+            monster_data = np.zeros((0, 6), dtype=np.float32)
+        self.monster_tracker.update(monster_data[monster_data[:, 4] >= self.monster_confidence], timestamp)
+    
+    def _propagate(self, result, movement_direction, timestamp):
+        char_box = self.character_tracker.predict(timestamp)[0]
+        center_x = int((char_box[0] + char_box[2]) / 2)
+        center_y = int((char_box[1] + char_box[3]) / 2)
+        result["character_pos"] = (center_x, center_y)
+        result["character_class"] = int(char_box[5])
+        result["character_bbox"] = [float(v) for v in char_box[:4]]
+        result["character_confidence"] = float(char_box[4])
+        self.last_character_pos = result["character_pos"]
+        self.last_character_class = result["character_class"]
+        self.last_character_time = time.time()
+        
+        attack_box = self._get_attack_box(result["character_pos"], movement_direction)
+        monster_data = self.monster_tracker.predict(timestamp)
+        table = build_monster_table(monster_data, self.monster_confidence, result["character_pos"], attack_box)
+        self._apply_monster_table(result, table)
+        result["character"] = {"screen_pos": result["character_pos"]}
+        return result
+    
+    def detect(self, frame, movement_direction=None, full_frame=False):
         if frame is None:
             return None
         
+        def copy_frame():
+            nonlocal frame
+            frame = frame.copy()
+        
+        with self.inference_gate.high(on_wait=copy_frame):
+            self._apply_pending_monster_model()
+            return self._detect(frame, movement_direction, full_frame)
+    
+    def _detect(self, frame, movement_direction, full_frame):        
         result = {
             "character_pos": None,
             "character_class": None,
+            "character_bbox": None,
+            "character_confidence": None,
             "monsters_in_range": False,
             "monster_direction": None,
             "monsters_info": [],
             "has_class_1_monster": False,
-            "monsters": []
+            "monsters": [],
+            "monster_roi": None,
+            "propagated": False
         }
         
+        timings = {}
+        start_time = time.perf_counter()
+        
         try:
-            char_results = self.character_model(frame, device='cuda:0', verbose=False)
-            if char_results and char_results[0].boxes is not None and len(char_results[0].boxes) > 0:
-                box_data = char_results[0].boxes.data[0]
-                box = box_data[:4].cpu().numpy()
-                center_x = int((box[0] + box[2]) / 2)
-                center_y = int((box[1] + box[3]) / 2)
+            thumbnail = None
+            if self.temporal_skip:
+                thumbnail = self._make_thumbnail(frame)
+                if not full_frame and self._can_propagate(thumbnail):
+                    self.frames_since_keyframe += 1
+                    result["propagated"] = True
+                    self._propagate(result, movement_direction, start_time)
+                    timings["total"] = (time.perf_counter() - start_time) * 1000
+                    result["timings"] = timings
+                    return result
+            
+            source = frame
+            letterbox = None
+            if self.shared_preprocess:
+                source, letterbox = self._preprocess(frame)
+            preprocess_done = time.perf_counter()
+            timings["preprocess"] = (preprocess_done - start_time) * 1000
+            
+            char_results = self.character_model(source, verbose=False)
+            char_data = self._get_box_data(char_results, letterbox)
+            monster_data = None
+            character_done = time.perf_counter()
+            timings["character"] = (character_done - preprocess_done) * 1000
+            
+            if char_data is not None:
+                box_data = char_data[0]
+                center_x = int((box_data[0] + box_data[2]) / 2)
+                center_y = int((box_data[1] + box_data[3]) / 2)
                 result["character_pos"] = (center_x, center_y)
-                result["character_class"] = int(box_data[5].cpu().numpy()) if len(box_data) > 5 else 0
+                result["character_class"] = int(box_data[5]) if len(box_data) > 5 else 0
+                result["character_bbox"] = [float(v) for v in box_data[:4]]
+                result["character_confidence"] = float(box_data[4])
                 self.last_character_pos = result["character_pos"]
                 self.last_character_class = result["character_class"]
                 self.last_character_time = time.time()
@@ -146,79 +528,40 @@ class DetectorEngine:
                 result["character_class"] = self.last_character_class
             
             if result["character_pos"]:
-                char_x, char_y = result["character_pos"]
+                attack_box = self._get_attack_box(result["character_pos"], movement_direction)
                 
-                attack_width = self.attack_range.get('width', 150)
-                attack_height = self.attack_range.get('height', 50)
+                monster_roi = None
+                if self.roi_active and not full_frame and \
+                        self.frames_since_full_frame < self.roi_full_frame_interval:
+                    monster_roi = self._get_monster_roi(frame.shape, attack_box)
                 
-                if self.hunting_direction == 'movement_only' and movement_direction:
-                    if movement_direction == 'left':
-                        attack_left = char_x - attack_width
-                        attack_right = char_x
-                    else:
-                        attack_left = char_x
-                        attack_right = char_x + attack_width
+                monster_start = time.perf_counter()
+                if monster_roi:
+                    monster_data = self._detect_monsters_in_roi(frame, monster_roi)
+                    self.frames_since_full_frame += 1
                 else:
-                    attack_left = char_x - attack_width
-                    attack_right = char_x + attack_width
-                
-                attack_top = char_y - attack_height
-                attack_bottom = char_y + attack_height
+                    monster_results = self.monster_model(source, verbose=False)
+                    monster_data = self._get_box_data(monster_results, letterbox)
+                    self.frames_since_full_frame = 0
+                timings["monster"] = (time.perf_counter() - monster_start) * 1000
+                result["monster_roi"] = monster_roi
                 
-                monster_results = self.monster_model(frame, device='cuda:0', verbose=False)
-                total_monsters = 0
-                in_range_monsters = 0
+                if monster_data is not None:
+                    postprocess_start = time.perf_counter()
+                    table = build_monster_table(monster_data, self.monster_confidence,
+                                                result["character_pos"], attack_box)
+                    self._apply_monster_table(result, table)
+                    timings["postprocess"] = (time.perf_counter() - postprocess_start) * 1000
                 
-                if monster_results and monster_results[0].boxes is not None:
-                    for box in monster_results[0].boxes.data:
-                        box_np = box[:4].cpu().numpy()
-                        monster_left = box_np[0]
-                        monster_top = box_np[1]
-                        monster_right = box_np[2]
-                        monster_bottom = box_np[3]
-                        confidence = float(box[4].cpu().numpy())
-                        monster_class = int(box[5].cpu().numpy()) if len(box) > 5 else 0
-                        
-                        if confidence < self.monster_confidence:
-                            continue
-                        
-                        total_monsters += 1
-                        
-                        monster_center_x = int((monster_left + monster_right) / 2)
-                        monster_center_y = int((monster_top + monster_bottom) / 2)
-                        
-                        monster_data = {
-                            "bbox": [monster_left, monster_top, monster_right, monster_bottom],
-                            "center": [monster_center_x, monster_center_y],
-                            "confidence": confidence,
-                            "class_id": monster_class
-                        }
-                        result["monsters"].append(monster_data)
-                        
-                        if monster_class == 1:
-                            result["has_class_1_monster"] = True
-                        
-                        if not (monster_right < attack_left or 
-                                monster_left > attack_right or 
-                                monster_bottom < attack_top or 
-                                monster_top > attack_bottom):
-                            
-                            direction = "left" if monster_center_x < char_x else "right"
-                            distance = np.sqrt((monster_center_x - char_x)**2 + (monster_center_y - char_y)**2)
-                            
-                            if distance > 20:
-                                in_range_monsters += 1
-                                result["monsters_info"].append({
-                                    "bbox": [monster_left, monster_top, monster_right, monster_bottom],
-                                    "center": (monster_center_x, monster_center_y),
-                                    "direction": direction,
-                                    "distance": distance,
-                                    "confidence": confidence,
-                                    "class_id": monster_class
-                                })
-                                
-                                result["monsters_in_range"] = True
-                                result["monster_direction"] = direction
+                if monster_roi:
+                    result["has_class_1_monster"] = result["has_class_1_monster"] or self.last_full_frame_class1
+                else:
+                    self.last_full_frame_class1 = result["has_class_1_monster"]
+            
+            if self.temporal_skip:
+                self._update_trackers(char_data, monster_data, start_time)
+                self.frames_since_keyframe = 0
+                self.keyframe_thumbnail = thumbnail
             
             result["character"] = {"screen_pos": result["character_pos"]} if result["character_pos"] else None
             
@@ -227,14 +570,25 @@ class DetectorEngine:
             import traceback
             traceback.print_exc()
         
+        timings["total"] = (time.perf_counter() - start_time) * 1000
+        self._record_timings(timings)
+        result["timings"] = timings
+        
         return result
     
-    def detect_lie(self, frame):
+    def detect_lie(self, frame, timeout=0.5):
         if not self.lie_model or frame is None:
             return False
         
         try:
-            results = self.lie_model(frame, conf=0.8, device='cuda:0', verbose=False)
+            if self.lie_stream is not None:
+                with torch.cuda.stream(self.lie_stream):
+                    results = self.lie_model(frame, conf=self.lie_confidence, verbose=False)
+            else:
+                with self.inference_gate.low(timeout) as acquired:
+                    if not acquired:
+                        return None
+                    results = self.lie_model(frame, conf=self.lie_confidence, verbose=False)
             return len(results) > 0 and results[0].boxes is not None and len(results[0].boxes) > 0
         except:
             return False
\ No newline at end of file
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import namedtuple
+
+FrameEntry = namedtuple('FrameEntry', ['seq', 'timestamp', 'main', 'minimap', 'minimap_rect'], defaults=(None,))
+
+class FrameBus:
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._seq = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._readers = {}
+        self._readers_lock = threading.Lock()
+
+    @property
+    def latest_seq(self):
+        return self._seq
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def publish(self, main, minimap=None, timestamp=None, minimap_rect=None):
+        seq = self._seq + 1
+        self._slots[seq % self.capacity] = FrameEntry(seq, timestamp, main, minimap, minimap_rect)
+
+        with self._cond:
+            self._seq = seq
+            self._cond.notify_all()
+        return seq
+
+    def get(self, seq):
+        entry = self._slots[seq % self.capacity]
+        if entry is None or entry.seq != seq:
+            return None
+        return entry
+
+    def latest(self):
+        for _ in range(3):
+            seq = self._seq
+            if seq == 0:
+                return None
+            entry = self.get(seq)
+            if entry is not None:
+                return entry
+        return None
+
+    def is_live(self, entry):
+        return entry is not None and entry.seq > self._seq - self.capacity
+
+    def wait_for(self, after_seq, timeout=None):
+        if self._seq > after_seq:
+            return True
+        with self._cond:
+            return self._cond.wait_for(lambda: self._seq > after_seq or self._closed, timeout)
+
+    def subscribe(self, name):
+        with self._readers_lock:
+            reader = self._readers.get(name)
+            if reader is None:
+                reader = FrameReader(self, name)
+                self._readers[name] = reader
+            return reader
+
+    def get_drop_stats(self):
+        with self._readers_lock:
+            readers = list(self._readers.values())
+        return {reader.name: {"received": reader.received, "dropped": reader.dropped} for reader in readers}
+
+    def reset(self):
+        with self._cond:
+            self._closed = False
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class FrameReader:
+    def __init__(self, bus, name):
+        self.bus = bus
+        self.name = name
+        self.last_seq = 0
+        self.received = 0
+        self.dropped = 0
+
+    def _accept(self, entry):
+        if self.last_seq:
+            self.dropped += max(0, entry.seq - self.last_seq - 1)
+        self.last_seq = entry.seq
+        self.received += 1
+        return entry
+
+    def has_new(self):
+        return self.bus.latest_seq > self.last_seq
+
+    def read_latest(self):
+        entry = self.bus.latest()
+        if entry is None or entry.seq <= self.last_seq:
+            return None
+        return self._accept(entry)
+
+    def peek_latest(self):
+        return self.bus.latest()
+
+    def wait_next(self, timeout=0.1):
+        if not self.bus.wait_for(self.last_seq, timeout):
+            return None
+
+        entry = self.read_latest()
+        if entry is None and self.bus.closed:
+            time.sleep(timeout)
+        return entry
@@ -0,0 +1,75 @@
+import threading
+import time
+
+class RateClock:
+    def __init__(self, target_fps):
+        self.period = 1.0 / target_fps
+        self.next_time = None
+
+    def wait(self):
+        now = time.perf_counter()
+        if self.next_time is None:
+            self.next_time = now
+
+        self.next_time += self.period
+        delay = self.next_time - now
+        if delay > 0:
+            time.sleep(delay)
+        elif -delay > self.period:
+            self.next_time = now
+
+    def reset(self):
+        self.next_time = None
+
+
+class StageRate:
+    def __init__(self, name, window=1.0):
+        self.name = name
+        self.window = window
+        self.count = 0
+        self.window_start = time.perf_counter()
+        self.rate = 0.0
+        self.total = 0
+
+    def tick(self):
+        self.count += 1
+        self.total += 1
+        now = time.perf_counter()
+        elapsed = now - self.window_start
+        if elapsed >= self.window:
+            self.rate = self.count / elapsed
+            self.count = 0
+            self.window_start = now
+
+
+class StageRates:
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = StageRate(name)
+                self._stages[name] = stage
+            return stage
+
+    def snapshot(self):
+        with self._lock:
+            stages = list(self._stages.values())
+
+        now = time.perf_counter()
+        rates = {}
+        for stage in stages:
+            if now - stage.window_start > stage.window * 3:
+                rates[stage.name] = 0.0
+            else:
+                rates[stage.name] = stage.rate
+        return rates
+
+    def format(self):
+        return ", ".join(f"{name}={rate:.1f}Hz" for name, rate in self.snapshot().items())
+
+
+stage_rates = StageRates()
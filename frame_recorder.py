@@ -0,0 +1,241 @@
+import os
+import json
+import glob
+import time
+import zipfile
+import threading
+import logging
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_POLICIES = {
+    "low_confidence": {"enabled": True, "threshold": 0.5, "interval": 2.0},
+    "class1": {"enabled": True, "interval": 1.0},
+    "lie": {"enabled": True, "interval": 1.0},
+    "periodic": {"enabled": False, "interval": 30.0}
+}
+
+def _yolo_line(class_id, box, frame_w, frame_h):
+    x1, y1, x2, y2 = [float(v) for v in box[:4]]
+    x1, x2 = max(x1, 0.0), min(x2, frame_w)
+    y1, y2 = max(y1, 0.0), min(y2, frame_h)
+    if x2 <= x1 or y2 <= y1:
+        return None
+
+    center_x = (x1 + x2) / 2 / frame_w
+    center_y = (y1 + y2) / 2 / frame_h
+    width = (x2 - x1) / frame_w
+    height = (y2 - y1) / frame_h
+    return f"{int(class_id)} {center_x:.6f} {center_y:.6f} {width:.6f} {height:.6f}"
+
+def build_yolo_labels(detection, frame_shape):
+    frame_h, frame_w = frame_shape[:2]
+    labels = {}
+
+    bbox = detection.get("character_bbox")
+    if bbox is not None:
+        line = _yolo_line(detection.get("character_class") or 0, bbox, frame_w, frame_h)
+        labels["character"] = [line] if line else []
+
+    table = detection.get("monster_table")
+    if table is not None:
+        lines = [_yolo_line(row["class_id"], row["bbox"], frame_w, frame_h) for row in table]
+        labels["monster"] = [line for line in lines if line]
+    elif detection.get("character_pos") is not None:
+        labels["monster"] = []
+
+    return labels
+
+
+class FrameRecorder:
+    def __init__(self, screen_capture, recorder_config=None):
+        self.screen_capture = screen_capture
+        self.config = recorder_config or {}
+        self.enabled = self.config.get('enabled', False)
+        self.output_dir = self.config.get('output_dir', 'dataset')
+        self.chunk_size = self.config.get('chunk_size', 200)
+        self.max_disk_bytes = self.config.get('max_disk_mb', 2048) * 1024 * 1024
+        self.max_pending = self.config.get('max_pending', 8)
+        self.jpeg_quality = self.config.get('jpeg_quality', 90)
+        self.workers = self.config.get('workers', 2)
+
+        self.policies = {}
+        for name, defaults in DEFAULT_POLICIES.items():
+            policy = dict(defaults)
+            policy.update(self.config.get('policies', {}).get(name, {}))
+            self.policies[name] = policy
+        self.last_record_time = {name: 0.0 for name in self.policies}
+
+        self.executor = None
+        self.pending = 0
+        self.pending_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+
+        self.session = time.strftime("%Y%m%d_%H%M%S")
+        self.chunk = None
+        self.chunk_index = 0
+        self.chunk_count = 0
+        self.chunk_manifest = []
+        self.disk_used = 0
+        self.budget_exceeded = False
+
+        self.stats = {"recorded": 0, "dropped": 0, "stale": 0}
+        self.running = False
+
+    def start(self):
+        if not self.enabled or self.running:
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.disk_used = sum(os.path.getsize(path) for path in glob.glob(os.path.join(self.output_dir, "*.zip")))
+        self.budget_exceeded = self.disk_used >= self.max_disk_bytes
+        if self.budget_exceeded:
+            logging.warning(f"⚠️ 프레임 기록 용량 초과 ({self.disk_used / 1024 / 1024:.0f}MB) - 기록하지 않습니다")
+
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="frame_recorder")
+        self.running = True
+        logging.info(f"🎞️ 프레임 기록 시작: {self.output_dir} (청크 {self.chunk_size}장, 최대 {self.max_disk_bytes // 1024 // 1024}MB)")
+
+    def stop(self):
+        if not self.running:
+            return
+
+        self.running = False
+        self.executor.shutdown(wait=True)
+        self.executor = None
+
+        with self.write_lock:
+            self._close_chunk()
+
+        logging.info(f"🎞️ 프레임 기록 종료: 저장 {self.stats['recorded']}장, "
+                     f"드랍 {self.stats['dropped']}장, 만료 {self.stats['stale']}장")
+
+    def _due(self, reason, now):
+        policy = self.policies.get(reason)
+        if not policy or not policy.get('enabled', True):
+            return False
+        return now - self.last_record_time[reason] >= policy.get('interval', 0.0)
+
+    def _is_full_inference(self, detection):
+        return not detection.get("propagated") and detection.get("monster_roi") is None
+
+    def _is_low_confidence(self, detection):
+        threshold = self.policies["low_confidence"].get('threshold', 0.5)
+        confidence = detection.get("character_confidence")
+        if confidence is not None and confidence < threshold:
+            return True
+
+        table = detection.get("monster_table")
+        return table is not None and bool(np.any(table["confidence"] < threshold))
+
+    def observe(self, frame, detection):
+        if not self.running or self.budget_exceeded or detection is None:
+            return
+        if not self._is_full_inference(detection):
+            return
+
+        now = time.time()
+        if detection.get("has_class_1_monster") and self._due("class1", now):
+            self.record(frame, detection, "class1")
+        elif self._due("low_confidence", now) and self._is_low_confidence(detection):
+            self.record(frame, detection, "low_confidence")
+        elif self._due("periodic", now):
+            self.record(frame, detection, "periodic")
+
+    def observe_lie(self, frame, detected, image=None):
+        if detected and self.running and not self.budget_exceeded and self._due("lie", time.time()):
+            self.record(frame, None, "lie", image)
+
+    def record(self, frame, detection, reason, image=None):
+        if not self.running or self.budget_exceeded or frame is None:
+            return False
+
+        with self.pending_lock:
+            if self.pending >= self.max_pending:
+                self.stats["dropped"] += 1
+                return False
+            self.pending += 1
+
+        if image is None:
+            image = frame.main.copy()
+            if not self.screen_capture.frame_bus.is_live(frame):
+                with self.pending_lock:
+                    self.pending -= 1
+                self.stats["stale"] += 1
+                return False
+
+        self.last_record_time[reason] = time.time()
+        meta = {
+            "seq": frame.seq,
+            "timestamp": frame.timestamp,
+            "reason": reason
+        }
+
+        try:
+            self.executor.submit(self._encode_and_store, image, detection, meta)
+        except (RuntimeError, AttributeError):
+            with self.pending_lock:
+                self.pending -= 1
+            return False
+        return True
+
+    def _encode_and_store(self, image, detection, meta):
+        try:
+            ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not ok:
+                logging.error("프레임 인코딩 실패")
+                return
+
+            labels = build_yolo_labels(detection, image.shape) if detection else {}
+            stem = f"{self.session}_{meta['seq']:08d}_{meta['reason']}"
+            meta["image"] = f"images/{stem}.jpg"
+            meta["size"] = [image.shape[1], image.shape[0]]
+
+            with self.write_lock:
+                self._write_sample(stem, encoded.tobytes(), labels, meta)
+        except Exception as e:
+            logging.error(f"프레임 기록 오류: {e}")
+        finally:
+            with self.pending_lock:
+                self.pending -= 1
+
+    def _open_chunk(self):
+        self.chunk_index += 1
+        path = os.path.join(self.output_dir, f"chunk_{self.session}_{self.chunk_index:04d}.zip")
+        self.chunk = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self.chunk_path = path
+        self.chunk_count = 0
+        self.chunk_manifest = []
+
+    def _close_chunk(self):
+        if self.chunk is None:
+            return
+
+        manifest = "\n".join(json.dumps(meta, ensure_ascii=False) for meta in self.chunk_manifest)
+        self.chunk.writestr("manifest.jsonl", manifest)
+        self.chunk.close()
+        self.chunk = None
+
+        size = os.path.getsize(self.chunk_path)
+        self.disk_used += size
+        logging.info(f"🎞️ 프레임 청크 저장: {self.chunk_path} ({self.chunk_count}장, {size / 1024 / 1024:.1f}MB)")
+
+        if self.disk_used >= self.max_disk_bytes and not self.budget_exceeded:
+            self.budget_exceeded = True
+            logging.warning(f"⚠️ 프레임 기록 용량 한도 도달 ({self.disk_used / 1024 / 1024:.0f}MB) - 기록 중지")
+
+    def _write_sample(self, stem, jpeg_bytes, labels, meta):
+        if self.chunk is None:
+            self._open_chunk()
+
+        self.chunk.writestr(meta["image"], jpeg_bytes, compress_type=zipfile.ZIP_STORED)
+        for model, lines in labels.items():
+            self.chunk.writestr(f"labels/{model}/{stem}.txt", "\n".join(lines))
+        self.chunk_manifest.append(meta)
+        self.chunk_count += 1
+        self.stats["recorded"] += 1
+
+        written = self.disk_used + sum(info.compress_size for info in self.chunk.infolist())
+        if self.chunk_count >= self.chunk_size or written >= self.max_disk_bytes:
+            self._close_chunk()
@@ -0,0 +1,238 @@
+import os
+import glob
+import time
+import logging
+import cv2
+import numpy as np
+from abc import ABC, abstractmethod
+
+class FrameSource(ABC):
+    name = "base"
+    self_paced = False
+
+    def __init__(self):
+        self.frame_shape = None
+
+    @abstractmethod
+    def is_available(self):
+        pass
+
+    @abstractmethod
+    def open(self):
+        pass
+
+    @abstractmethod
+    def read(self, out=None):
+        pass
+
+    def grab_region(self, left, top, width, height):
+        return None
+
+    def get_origin(self):
+        return (0, 0)
+
+    @abstractmethod
+    def close(self):
+        pass
+
+
+class MssFrameSource(FrameSource):
+    name = "mss"
+
+    def __init__(self, window_title="Mapleland"):
+        super().__init__()
+        self.window_title = window_title
+        self.game_window = None
+        self.sct = None
+        self.region = None
+        self._find_game_window()
+
+    def _find_game_window(self):
+        import pygetwindow as gw
+
+        wins = gw.getWindowsWithTitle(self.window_title)
+        if wins:
+            self.game_window = wins[0]
+            self.frame_shape = (self.game_window.height, self.game_window.width)
+            logging.info(f"✅ 게임 창 찾음: {self.game_window.width}x{self.game_window.height}")
+            logging.info(f"  → 위치: ({self.game_window.left}, {self.game_window.top})")
+        else:
+            logging.error(f"❌ {self.window_title} 창을 찾을 수 없습니다")
+            self.game_window = None
+
+    def is_available(self):
+        return self.game_window is not None
+
+    def open(self):
+        import mss
+
+        if not self.game_window:
+            return False
+
+        self.region = {
+            "left": self.game_window.left,
+            "top": self.game_window.top,
+            "width": self.game_window.width,
+            "height": self.game_window.height
+        }
+        self.frame_shape = (self.region["height"], self.region["width"])
+        self.sct = mss.mss()
+        logging.info(f"  → 게임 영역: {self.region}")
+        return True
+
+    def read(self, out=None):
+        shot = self.sct.grab(self.region)
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        if out is None or out.shape[:2] != (shot.height, shot.width):
+            out = np.empty((shot.height, shot.width, 3), dtype=np.uint8)
+        np.copyto(out, bgra[:, :, :3])
+        return out
+
+    def grab_region(self, left, top, width, height):
+        region = {
+            "left": self.region["left"] + left,
+            "top": self.region["top"] + top,
+            "width": width,
+            "height": height
+        }
+        shot = self.sct.grab(region)
+        return np.array(shot)[:, :, :3].copy()
+
+    def get_origin(self):
+        if self.region:
+            return (self.region["left"], self.region["top"])
+        if self.game_window:
+            return (self.game_window.left, self.game_window.top)
+        return (0, 0)
+
+    def close(self):
+        if self.sct:
+            self.sct.close()
+            self.sct = None
+
+
+class ReplayFrameSource(FrameSource):
+    name = "replay"
+    self_paced = True
+
+    IMAGE_EXTENSIONS = ['*.png', '*.jpg', '*.jpeg', '*.bmp']
+
+    def __init__(self, path, realtime=True, fps=60.0, loop=False):
+        super().__init__()
+        self.path = path
+        self.realtime = realtime
+        self.fps = fps
+        self.loop = loop
+        self.mode = None
+        self.image_files = []
+        self.frames = None
+        self.video = None
+        self.frame_index = 0
+        self.frame_count = 0
+        self.start_time = None
+        self._detect_mode()
+
+    def _detect_mode(self):
+        if os.path.isdir(self.path):
+            self.mode = "images"
+            for ext in self.IMAGE_EXTENSIONS:
+                self.image_files.extend(glob.glob(os.path.join(self.path, ext)))
+            self.image_files.sort()
+        elif self.path.endswith('.npy'):
+            self.mode = "npy"
+        elif os.path.exists(self.path):
+            self.mode = "video"
+        else:
+            logging.error(f"❌ 리플레이 경로를 찾을 수 없습니다: {self.path}")
+
+    def is_available(self):
+        if self.mode == "images":
+            return len(self.image_files) > 0
+        return self.mode is not None
+
+    def open(self):
+        if self.mode == "images":
+            first = cv2.imread(self.image_files[0], cv2.IMREAD_COLOR) if self.image_files else None
+            if first is None:
+                logging.error(f"❌ 리플레이 이미지 로드 실패: {self.path}")
+                return False
+            self.frame_shape = first.shape[:2]
+            self.frame_count = len(self.image_files)
+        elif self.mode == "npy":
+            self.frames = np.load(self.path, mmap_mode='r')
+            if self.frames.ndim != 4 or self.frames.shape[3] < 3:
+                logging.error(f"❌ .npy 형식 오류 (N,H,W,3 필요): {self.frames.shape}")
+                return False
+            self.frame_shape = self.frames.shape[1:3]
+            self.frame_count = self.frames.shape[0]
+        elif self.mode == "video":
+            self.video = cv2.VideoCapture(self.path)
+            if not self.video.isOpened():
+                logging.error(f"❌ 영상 파일 열기 실패: {self.path}")
+                return False
+            video_fps = self.video.get(cv2.CAP_PROP_FPS)
+            if video_fps and video_fps > 0:
+                self.fps = video_fps
+            self.frame_shape = (int(self.video.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                                int(self.video.get(cv2.CAP_PROP_FRAME_WIDTH)))
+            self.frame_count = int(self.video.get(cv2.CAP_PROP_FRAME_COUNT))
+        else:
+            return False
+
+        self.frame_index = 0
+        self.start_time = time.perf_counter()
+        logging.info(f"🎞️ 리플레이 시작: {self.path} ({self.mode}, {self.frame_count}프레임, "
+                     f"{'실시간 ' + format(self.fps, '.0f') + 'fps' if self.realtime else '최대 속도'})")
+        return True
+
+    def _rewind(self):
+        self.frame_index = 0
+        self.start_time = time.perf_counter()
+        if self.video is not None:
+            self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def _read_raw(self):
+        if self.mode == "images":
+            if self.frame_index >= len(self.image_files):
+                return None
+            return cv2.imread(self.image_files[self.frame_index], cv2.IMREAD_COLOR)
+
+        if self.mode == "npy":
+            if self.frame_index >= self.frame_count:
+                return None
+            return self.frames[self.frame_index, :, :, :3]
+
+        ret, frame = self.video.read()
+        return frame if ret else None
+
+    def _wait_for_frame_time(self):
+        if not self.realtime or self.fps <= 0:
+            return
+
+        target_time = self.start_time + self.frame_index / self.fps
+        delay = target_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def read(self, out=None):
+        frame = self._read_raw()
+        if frame is None and self.loop and self.frame_index > 0:
+            self._rewind()
+            frame = self._read_raw()
+
+        if frame is None:
+            return None
+
+        self._wait_for_frame_time()
+        self.frame_index += 1
+
+        if out is not None and out.shape == frame.shape:
+            np.copyto(out, frame)
+            return out
+        return np.ascontiguousarray(frame)
+
+    def close(self):
+        if self.video is not None:
+            self.video.release()
+            self.video = None
+        self.frames = None
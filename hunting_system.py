@@ -13,6 +13,7 @@ class HuntingSystem:
         self.is_hunting = False
         self.original_direction = None
         self.get_detection_func = None
+        self.wait_detection_func = None
         
         self.hunting_direction = hunting_config.get('hunting_direction', 'movement_only')
         self.look_at_monster = hunting_config.get('look_at_monster', True)
@@ -22,8 +23,15 @@ class HuntingSystem:
         self.monster_present_frames = 0
         self.monster_absent_frames = 0
     
-    def set_detection_function(self, func):
+    def set_detection_function(self, func, wait_func=None):
         self.get_detection_func = func
+        self.wait_detection_func = wait_func
+    
+    def _wait_for_next_detection(self, detection_seq):
+        if self.wait_detection_func and detection_seq is not None:
+            self.wait_detection_func(detection_seq, 0.1)
+        else:
+            time.sleep(0.016)
     
     def _is_ignoring_class1(self):
         if not self.bot_core or not hasattr(self.bot_core, 'class1_handler'):
@@ -178,6 +186,8 @@ class HuntingSystem:
         first_attack_done = False
         loop_count = 0
         
+        detection_seq = None
+        
         if attack_key not in pressed_keys:
             try:
                 self.key_controller.press_and_hold(attack_key)
@@ -194,7 +204,7 @@ class HuntingSystem:
             
             if self.get_detection_func:
                 try:
-                    _, detection = self.get_detection_func()
+                    detection_seq, detection = self.get_detection_func()
                 except Exception as e:
                     logging.error(f"get_detection_func 호출 오류: {e}")
                     import traceback
@@ -202,7 +212,7 @@ class HuntingSystem:
                     break
                 
                 if detection is None:
-                    time.sleep(0.016)
+                    self._wait_for_next_detection(detection_seq)
                     continue
                 
                 character_class = detection.get('character_class')
@@ -258,7 +268,7 @@ class HuntingSystem:
                 time.sleep(0.5)
                 break
             
-            time.sleep(0.016)
+            self._wait_for_next_detection(detection_seq)
         
         if attack_key in self.key_controller.get_pressed_keys():
             self.key_controller.release_key(attack_key)
@@ -289,10 +299,10 @@ class HuntingSystem:
                 break
                 
             if self.get_detection_func:
-                _, detection = self.get_detection_func()
+                detection_seq, detection = self.get_detection_func()
                 
                 if detection is None:
-                    time.sleep(0.016)
+                    self._wait_for_next_detection(detection_seq)
                     continue
                 
                 character_class = detection.get('character_class')
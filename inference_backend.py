@@ -0,0 +1,77 @@
+import os
+import logging
+import numpy as np
+import torch
+from ultralytics import YOLO
+
+BACKENDS = {
+    "tensorrt": {"suffix": ".engine", "device": "cuda:0", "needs_cuda": True, "static_shape": True},
+    "torch_cuda": {"suffix": ".pt", "device": "cuda:0", "needs_cuda": True, "static_shape": False},
+    "openvino": {"suffix": "_openvino_model", "device": "cpu", "needs_cuda": False, "static_shape": True},
+    "onnxruntime": {"suffix": ".onnx", "device": "cpu", "needs_cuda": False, "static_shape": True},
+    "torch_cpu": {"suffix": ".pt", "device": "cpu", "needs_cuda": False, "static_shape": False}
+}
+
+DEFAULT_BACKEND_ORDER = ["tensorrt", "torch_cuda", "openvino", "onnxruntime", "torch_cpu"]
+
+def model_base_path(model_path):
+    path = model_path.rstrip("/\\")
+    for backend in BACKENDS.values():
+        if path.endswith(backend["suffix"]):
+            return path[:-len(backend["suffix"])]
+    return path
+
+def resolve_candidates(model_path, backends=None):
+    base_path = model_base_path(model_path)
+    cuda_available = torch.cuda.is_available()
+    candidates = []
+
+    for name in backends or DEFAULT_BACKEND_ORDER:
+        backend = BACKENDS.get(name)
+        if backend is None:
+            logging.warning(f"⚠️ 알 수 없는 추론 백엔드: {name}")
+            continue
+        if backend["needs_cuda"] and not cuda_available:
+            continue
+
+        path = base_path + backend["suffix"]
+        if os.path.exists(path):
+            candidates.append((name, path))
+
+    return candidates
+
+
+class InferenceModel:
+    def __init__(self, model, backend, path):
+        self.model = model
+        self.backend = backend
+        self.path = path
+        self.device = BACKENDS[backend]["device"]
+        self.static_shape = BACKENDS[backend]["static_shape"]
+
+    def __call__(self, source, **kwargs):
+        kwargs.setdefault('device', self.device)
+        return self.model(source, **kwargs)
+
+    def warmup(self, imgsz=640):
+        dummy_image = np.random.randint(0, 255, (imgsz, imgsz, 3), dtype=np.uint8)
+        self(dummy_image, verbose=False)
+
+
+def load_model(model_path, backends=None, imgsz=640):
+    candidates = resolve_candidates(model_path, backends)
+    if not candidates:
+        logging.error(f"❌ 사용 가능한 모델 파일이 없습니다: {model_base_path(model_path)}.*")
+        return None
+
+    for backend, path in candidates:
+        try:
+            model = InferenceModel(YOLO(path, task='detect'), backend, path)
+            model.warmup(imgsz)
+            logging.info(f"✅ 모델 로드 ({backend}, {model.device}): {path}")
+            return model
+        except Exception as e:
+            logging.warning(f"⚠️ {backend} 백엔드 로드 실패, 다음 백엔드 시도: {path} ({e})")
+
+    logging.error(f"❌ 모든 백엔드에서 모델 로드 실패: {model_base_path(model_path)}")
+    return None
@@ -0,0 +1,73 @@
+import threading
+import time
+import logging
+
+from frame_pacer import RateClock, stage_rates
+
+class LieDetectorWorker:
+    def __init__(self, detector_engine, screen_capture, interval=0.2, frame_recorder=None):
+        self.detector_engine = detector_engine
+        self.frame_recorder = frame_recorder
+        self.frame_bus = screen_capture.frame_bus
+        self.frame_reader = screen_capture.subscribe("lie_detector")
+        self.interval = interval
+        self.running = False
+        self.thread = None
+
+        self.latest_result = None
+        self.latest_time = 0
+        self.latest_frame_seq = 0
+        self.result_cond = threading.Condition()
+
+    def start(self):
+        if not self.detector_engine.lie_model:
+            logging.info("🔍 거탐 모델 없음 - 거탐 워커 비활성화")
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self.thread.start()
+        logging.info(f"🔍 거탐 워커 시작 (주기 {self.interval:.2f}초)")
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def get_latest(self, max_age=None):
+        with self.result_cond:
+            if self.latest_result is None:
+                return None
+            if max_age is not None and time.time() - self.latest_time > max_age:
+                return None
+            return self.latest_result
+
+    def wait_for_result(self, after_time, timeout=1.0):
+        with self.result_cond:
+            self.result_cond.wait_for(lambda: self.latest_time > after_time, timeout)
+            return self.latest_result if self.latest_time > after_time else None
+
+    def _worker_loop(self):
+        clock = RateClock(1.0 / self.interval)
+        lie_rate = stage_rates.get("lie")
+
+        while self.running:
+            try:
+                frame = self.frame_reader.wait_next(timeout=self.interval)
+                image = frame.main.copy() if frame is not None else None
+                if image is not None and self.frame_bus.is_live(frame):
+                    detected = self.detector_engine.detect_lie(image)
+                    if detected is not None:
+                        with self.result_cond:
+                            self.latest_result = detected
+                            self.latest_time = time.time()
+                            self.latest_frame_seq = frame.seq
+                            self.result_cond.notify_all()
+                        lie_rate.tick()
+                        if self.frame_recorder:
+                            self.frame_recorder.observe_lie(frame, detected, image)
+            except Exception as e:
+                logging.error(f"거탐 워커 오류: {e}")
+
+            clock.wait()
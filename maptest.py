@@ -3,18 +3,21 @@ import numpy as np
 import json
 import os
 import time
-import mss
 import pygetwindow as gw
 from scroll_tracker import ScrollTracker
+from screen_capture import ScreenCapture
 from constants import YELLOW_DOT_RANGE
+from region_index import ZoneIndex
 
 class ScrollDebugger:
     def __init__(self):
         self.game_window = None
+        self.screen_capture = None
         self.map_config = None
         self.scroll_tracker = ScrollTracker()
         self.minimap_info = {}
         self.zones = []
+        self.zone_index = ZoneIndex([])
         self.running = True
         self.last_console_time = 0
         self.console_interval = 0.5
@@ -78,6 +81,7 @@ class ScrollDebugger:
         
         self.minimap_info = self.map_config.get("minimap", {})
         self.zones = self.map_config.get("zones", [])
+        self.zone_index = ZoneIndex(self.zones)
         
         self.scroll_tracker.update_map_config(self.map_config)
         
@@ -109,16 +113,7 @@ class ScrollDebugger:
         return True
     
     def capture_minimap(self):
-        with mss.mss() as sct:
-            monitor = {
-                "left": self.game_window.left + self.minimap_info["left"],
-                "top": self.game_window.top + self.minimap_info["top"],
-                "width": self.minimap_info["width"],
-                "height": self.minimap_info["height"]
-            }
-            shot = sct.grab(monitor)
-            frame = np.array(shot)
-            return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+        return self.screen_capture.get_minimap(timeout=0.5, copy=True)
     
     def detect_yellow_dot(self, minimap):
         hsv = cv2.cvtColor(minimap, cv2.COLOR_BGR2HSV)
@@ -147,19 +142,7 @@ class ScrollDebugger:
         scroll_x_640 = scroll_offset.get("x", 0) * scale_to_640
         scroll_y_640 = scroll_offset.get("y", 0) * scale_to_640
         
-        for zone in self.zones:
-            bbox = zone.get("bbox_640", [])
-            if len(bbox) == 4:
-                x1, y1, x2, y2 = bbox
-                
-                ox1 = int(x1 + scroll_x_640)
-                oy1 = int(y1 + scroll_y_640)
-                ox2 = int(x2 + scroll_x_640)
-                oy2 = int(y2 + scroll_y_640)
-                
-                if ox1 <= x_640 <= ox2 and oy1 <= y_640 <= oy2:
-                    return zone["id"]
-        return None
+        return self.zone_index.lookup(x_640, y_640, scroll_x_640, scroll_y_640)
     
     def draw_zones(self, display, scale_factor, scroll_offset):
         scale_to_640 = self.minimap_info.get("scale_to_640", 1.0)
@@ -205,6 +188,11 @@ class ScrollDebugger:
         if not self.load_map_config(map_info):
             return
         
+        self.screen_capture = ScreenCapture(self.minimap_info)
+        if not self.screen_capture.start():
+            print("❌ 화면 캡처를 시작할 수 없습니다.")
+            return
+        
         cv2.namedWindow("Scroll Debug", cv2.WINDOW_NORMAL)
         
         print("\n🔍 스크롤 추적 디버깅 시작!")
@@ -220,6 +208,8 @@ class ScrollDebugger:
             try:
                 current_time = time.time()
                 minimap = self.capture_minimap()
+                if minimap is None:
+                    continue
                 
                 if self.scroll_tracker.scroll_enabled:
                     self.scroll_tracker.detect_minimap_scroll(minimap)
@@ -327,6 +317,7 @@ class ScrollDebugger:
                 traceback.print_exc()
                 time.sleep(0.1)
         
+        self.screen_capture.stop()
         cv2.destroyAllWindows()
 
 if __name__ == "__main__":
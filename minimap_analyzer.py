@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+import threading
+from collections import namedtuple
+
+from constants import MINIMAP_COLOR_CLASSES
+from color_lut import get_color_lut
+
+MinimapDot = namedtuple('MinimapDot', ['x', 'y', 'area'])
+MinimapAnalysis = namedtuple('MinimapAnalysis', ['seq', 'timestamp', 'dots', 'counts', 'mask'])
+
+class MinimapAnalyzer:
+    def __init__(self, color_classes=None):
+        self.color_classes = {}
+        self.lut = None
+        self.lock = threading.Lock()
+        self.latest = None
+        self.set_color_classes(color_classes or MINIMAP_COLOR_CLASSES)
+
+    def set_color_classes(self, color_classes):
+        compiled = {}
+        for name, spec in color_classes.items():
+            compiled[name] = {
+                "min_area": spec.get("min_area", 0),
+                "max_area": spec.get("max_area")
+            }
+        lut = get_color_lut(color_classes)
+        with self.lock:
+            self.color_classes = compiled
+            self.lut = lut
+            self.latest = None
+
+    def _find_dots(self, mask, spec):
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        dots = []
+        for contour in contours:
+            area = cv2.contourArea(contour)
+            if area < spec["min_area"]:
+                continue
+            if spec["max_area"] is not None and area > spec["max_area"]:
+                continue
+
+            M = cv2.moments(contour)
+            if M["m00"] > 0:
+                dots.append(MinimapDot(int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"]), area))
+            elif spec["min_area"] == 0:
+                dots.append(MinimapDot(None, None, area))
+
+        dots.sort(key=lambda dot: dot.area, reverse=True)
+        return dots
+
+    def analyze(self, minimap, seq=None, timestamp=None):
+        if minimap is None or minimap.size == 0:
+            return None
+
+        with self.lock:
+            if seq is not None and self.latest is not None and self.latest.seq == seq:
+                return self.latest
+
+            labels = self.lut.classify(minimap)
+            union = (labels > 0).view(np.uint8) * np.uint8(255)
+            dots = {}
+            counts = {}
+
+            for name, spec in self.color_classes.items():
+                mask = self.lut.mask(labels, name)
+                class_dots = self._find_dots(mask, spec)
+                dots[name] = class_dots
+                counts[name] = len(class_dots)
+
+            analysis = MinimapAnalysis(seq, timestamp, dots, counts, union)
+            if seq is not None:
+                self.latest = analysis
+            return analysis
+
+    def analyze_frame(self, frame):
+        if frame is None:
+            return None
+        return self.analyze(frame.minimap, frame.seq, frame.timestamp)
+
+    def get_latest(self):
+        with self.lock:
+            return self.latest
+
+
+minimap_analyzer = MinimapAnalyzer()
@@ -0,0 +1,158 @@
+import os
+import threading
+import logging
+from collections import OrderedDict
+
+from inference_backend import model_base_path
+
+def estimate_model_size_mb(path):
+    if os.path.isdir(path):
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                total += os.path.getsize(os.path.join(root, name))
+        return total / (1024 * 1024)
+    if os.path.exists(path):
+        return os.path.getsize(path) / (1024 * 1024)
+    return 0.0
+
+
+class ModelRegistry:
+    def __init__(self, loader, memory_budget_mb=4096):
+        self.loader = loader
+        self.memory_budget_mb = memory_budget_mb
+        self.models = OrderedDict()
+        self.sizes = {}
+        self.pending = {}
+        self.pinned = set()
+        self.lock = threading.Lock()
+        self.preload_thread = None
+
+    def _total_size(self):
+        return sum(self.sizes.values())
+
+    def is_loaded(self, model_path):
+        with self.lock:
+            return model_base_path(model_path) in self.models
+
+    def preload(self, model_paths):
+        queue_paths = []
+        queued = set()
+        with self.lock:
+            for path in model_paths:
+                key = model_base_path(path)
+                if key in self.models or key in self.pending or key in queued:
+                    continue
+                queued.add(key)
+                queue_paths.append(path)
+
+        if not queue_paths:
+            return
+
+        logging.info(f"📦 몬스터 모델 미리 로드 시작: {len(queue_paths)}개 (중복 제외)")
+        self.preload_thread = threading.Thread(target=self._preload_loop, args=(queue_paths,), daemon=True)
+        self.preload_thread.start()
+
+    def _preload_loop(self, model_paths):
+        for path in model_paths:
+            key = model_base_path(path)
+            with self.lock:
+                if key in self.models or key in self.pending:
+                    continue
+                over_budget = self._total_size() >= self.memory_budget_mb
+                if not over_budget:
+                    self.pending[key] = threading.Event()
+            if over_budget:
+                logging.info(f"📦 메모리 예산 초과로 미리 로드 중단: {key}")
+                continue
+
+            try:
+                self._load_and_insert(path)
+            except Exception as e:
+                logging.error(f"📦 모델 미리 로드 실패: {path} ({e})")
+            finally:
+                self._finish_pending(key)
+
+        logging.info("📦 몬스터 모델 미리 로드 완료")
+
+    def _finish_pending(self, key):
+        with self.lock:
+            event = self.pending.pop(key, None)
+        if event:
+            event.set()
+
+    def _load_and_insert(self, model_path):
+        model = self.loader(model_path)
+        if model is None:
+            return None
+
+        key = model_base_path(model_path)
+        with self.lock:
+            self.models[key] = model
+            self.models.move_to_end(key)
+            self.sizes[key] = estimate_model_size_mb(model.path)
+            self._evict_locked()
+        logging.info(f"📦 모델 등록: {model.path} ({self.sizes.get(key, 0):.0f}MB, 총 {self._total_size():.0f}MB)")
+        return model
+
+    def _evict_locked(self):
+        while self._total_size() > self.memory_budget_mb and len(self.models) > 1:
+            victim = None
+            for key in self.models:
+                if key not in self.pinned:
+                    victim = key
+                    break
+            if victim is None:
+                break
+
+            self.models.pop(victim)
+            size = self.sizes.pop(victim, 0)
+            logging.info(f"📦 LRU 모델 해제: {victim} ({size:.0f}MB)")
+
+    def get(self, model_path, wait_timeout=0.0):
+        key = model_base_path(model_path)
+        with self.lock:
+            model = self.models.get(key)
+            if model is not None:
+                self.models.move_to_end(key)
+                return model
+            event = self.pending.get(key)
+
+        if event and wait_timeout > 0:
+            event.wait(wait_timeout)
+            with self.lock:
+                model = self.models.get(key)
+                if model is not None:
+                    self.models.move_to_end(key)
+                return model
+        return None
+
+    def acquire(self, model_path, pin=False):
+        key = model_base_path(model_path)
+        while True:
+            with self.lock:
+                if pin:
+                    self.pinned = {key}
+
+                model = self.models.get(key)
+                if model is not None:
+                    self.models.move_to_end(key)
+                    return model
+
+                event = self.pending.get(key)
+                if event is None:
+                    self.pending[key] = threading.Event()
+                    break
+
+            logging.info(f"📦 로드 중인 모델 대기: {key}")
+            event.wait()
+
+        try:
+            return self._load_and_insert(model_path)
+        finally:
+            self._finish_pending(key)
+
+    def pin(self, model_path):
+        with self.lock:
+            self.pinned = {model_base_path(model_path)}
+            self._evict_locked()
@@ -0,0 +1,102 @@
+import cv2
+import numpy as np
+
+from constants import MINIMAP_COLOR_CLASSES
+from color_lut import get_color_lut
+
+class PhaseScrollEstimator:
+    def __init__(self, min_confidence=0.2, rekey_confidence=0.4, max_step=None, dot_padding=3,
+                 confirm_frames=3, lost_frames=10):
+        self.min_confidence = min_confidence
+        self.rekey_confidence = rekey_confidence
+        self.max_step = max_step
+        self.confirm_frames = confirm_frames
+        self.lost_frames = lost_frames
+        self.dot_kernel = np.ones((dot_padding * 2 + 1, dot_padding * 2 + 1), np.uint8)
+        self.window = None
+        self.reset()
+
+    def reset(self):
+        self.reference = None
+        self.reference_offset = (0.0, 0.0)
+        self.offset = {"x": 0.0, "y": 0.0}
+        self.last_shift = (0.0, 0.0)
+        self.confidence = 0.0
+        self.candidate_shift = None
+        self.candidate_count = 0
+        self.lost_count = 0
+
+    def _rekey(self, current):
+        self.reference = current
+        self.reference_offset = (self.offset["x"], self.offset["y"])
+        self.last_shift = (0.0, 0.0)
+        self.candidate_shift = None
+        self.candidate_count = 0
+
+    def correct(self, x, y):
+        self.reference_offset = (self.reference_offset[0] + x - self.offset["x"],
+                                 self.reference_offset[1] + y - self.offset["y"])
+        self.offset["x"] = x
+        self.offset["y"] = y
+
+    def _confirm_jump(self, shift_x, shift_y):
+        if self.candidate_shift is not None and \
+                abs(shift_x - self.candidate_shift[0]) <= self.max_step and \
+                abs(shift_y - self.candidate_shift[1]) <= self.max_step:
+            self.candidate_count += 1
+        else:
+            self.candidate_count = 1
+        self.candidate_shift = (shift_x, shift_y)
+        return self.candidate_count >= self.confirm_frames
+
+    def _prepare(self, minimap, dot_mask=None):
+        if dot_mask is None:
+            labels = get_color_lut(MINIMAP_COLOR_CLASSES).classify(minimap)
+            dot_mask = (labels > 0).view(np.uint8) * np.uint8(255)
+        mask = cv2.dilate(dot_mask, self.dot_kernel)
+
+        gray = cv2.cvtColor(minimap, cv2.COLOR_BGR2GRAY).astype(np.float32)
+        if cv2.countNonZero(mask):
+            background = cv2.mean(gray, mask=cv2.bitwise_not(mask))[0]
+            gray[mask > 0] = background
+
+        if self.window is None or self.window.shape != gray.shape:
+            self.window = cv2.createHanningWindow((gray.shape[1], gray.shape[0]), cv2.CV_32F)
+        return gray
+
+    def update(self, minimap, dot_mask=None):
+        if minimap is None or minimap.size == 0:
+            return {"x": 0.0, "y": 0.0, "confidence": 0.0}
+
+        current = self._prepare(minimap, dot_mask)
+        if self.reference is None or self.reference.shape != current.shape:
+            self._rekey(current)
+            self.confidence = 1.0
+            return {"x": 0.0, "y": 0.0, "confidence": 1.0}
+
+        (shift_x, shift_y), response = cv2.phaseCorrelate(self.reference, current, self.window)
+        self.confidence = float(response)
+
+        if response < self.min_confidence:
+            self.lost_count += 1
+            if self.lost_count >= self.lost_frames:
+                self._rekey(current)
+            return {"x": 0.0, "y": 0.0, "confidence": self.confidence}
+        self.lost_count = 0
+
+        step_x = shift_x - self.last_shift[0]
+        step_y = shift_y - self.last_shift[1]
+        if self.max_step is not None and (abs(step_x) > self.max_step or abs(step_y) > self.max_step):
+            if not self._confirm_jump(shift_x, shift_y):
+                return {"x": 0.0, "y": 0.0, "confidence": self.confidence}
+
+        self.candidate_shift = None
+        self.candidate_count = 0
+        self.last_shift = (shift_x, shift_y)
+        self.offset["x"] = self.reference_offset[0] + shift_x
+        self.offset["y"] = self.reference_offset[1] + shift_y
+
+        if response < self.rekey_confidence:
+            self._rekey(current)
+
+        return {"x": float(step_x), "y": float(step_y), "confidence": self.confidence}
@@ -0,0 +1,97 @@
+import os
+import time
+import tempfile
+import cv2
+import numpy as np
+
+from phase_scroll import PhaseScrollEstimator
+from scroll_tracker import ScrollTracker
+
+WORLD_SIZE = 700
+VIEW_W = 220
+VIEW_H = 150
+ORIGIN = 250
+
+def make_world(seed=0):
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 255, (WORLD_SIZE, WORLD_SIZE, 3), dtype=np.uint8)
+    world = cv2.GaussianBlur(noise, (0, 0), 3)
+    world = cv2.normalize(world, None, 0, 255, cv2.NORM_MINMAX)
+    for x in range(0, WORLD_SIZE, 90):
+        cv2.rectangle(world, (x, 40), (x + 18, 60), (255, 255, 255), -1)
+        cv2.circle(world, (x + 40, 120), 8, (0, 0, 0), -1)
+    return world
+
+def view(world, scroll_x, scroll_y=0):
+    left = ORIGIN - scroll_x
+    top = ORIGIN - scroll_y
+    return world[top:top + VIEW_H, left:left + VIEW_W].copy()
+
+def check(name, passed, detail):
+    print(f"{'✅' if passed else '❌'} {name}: {detail}")
+    return passed
+
+def test_jump_then_smooth(world):
+    estimator = PhaseScrollEstimator(max_step=20)
+    path = [0] * 5 + [35] + list(range(36, 79))
+    for scroll_x in path:
+        estimator.update(view(world, scroll_x))
+
+    offset = estimator.offset["x"]
+    return check("큰 점프 후 복구", abs(offset - path[-1]) < 2.0, f"기대 {path[-1]}, 결과 {offset:.1f}")
+
+def test_lost_frames(world):
+    estimator = PhaseScrollEstimator(max_step=20, lost_frames=5)
+    rng = np.random.default_rng(1)
+    for scroll_x in range(0, 20, 2):
+        estimator.update(view(world, scroll_x))
+
+    for _ in range(6):
+        estimator.update(rng.integers(0, 255, (VIEW_H, VIEW_W, 3), dtype=np.uint8))
+
+    estimator.update(view(world, 20))
+    base = estimator.offset["x"]
+    for scroll_x in range(22, 42, 2):
+        estimator.update(view(world, scroll_x))
+
+    moved = estimator.offset["x"] - base
+    return check("추적 손실 후 재기준", abs(moved - 20) < 2.0, f"복구 후 이동 기대 20, 결과 {moved:.1f}")
+
+def test_landmark_reacquire(world):
+    landmark = world[ORIGIN + 30:ORIGIN + 60, ORIGIN + 80:ORIGIN + 120]
+    path = os.path.join(tempfile.mkdtemp(), "landmark.png")
+    cv2.imwrite(path, landmark)
+
+    tracker = ScrollTracker()
+    tracker.update_map_config({
+        "scroll_enabled": True,
+        "scroll_method": "phase",
+        "scroll_tracking_files": [path],
+        "scroll_reacquire_interval": 0.0,
+        "minimap": {"scale_to_640": 1.0}
+    })
+
+    tracker.detect_minimap_scroll(view(world, 0))
+    tracker.phase_estimator.correct(-40.0, 0.0)
+    for scroll_x in range(0, 12, 2):
+        tracker.detect_minimap_scroll(view(world, scroll_x))
+        time.sleep(0.001)
+
+    offset = tracker.get_current_scroll_offset()["x"]
+    return check("랜드마크 절대 보정", abs(offset - 10) < 2.0, f"기대 10, 결과 {offset:.1f}")
+
+def main():
+    print("📜 위상 상관 스크롤 테스트")
+    print("=" * 50)
+    world = make_world()
+    results = [
+        test_jump_then_smooth(world),
+        test_lost_frames(world),
+        test_landmark_reacquire(world)
+    ]
+    print("-" * 50)
+    print(f"통과 {sum(results)}/{len(results)}")
+    return all(results)
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,103 @@
+import math
+import numpy as np
+import logging
+from collections import namedtuple
+
+FLAG_NO_HUNT = 1
+FLAG_NO_TELEPORT = 2
+
+RegionInfo = namedtuple('RegionInfo', ['zone', 'no_hunt', 'no_teleport'])
+
+def _pixel_box(box):
+    x1, y1, x2, y2 = box
+    return math.ceil(x1), math.ceil(y1), math.floor(x2), math.floor(y2)
+
+def _raster_extent(boxes):
+    coords = np.array(boxes)
+    origin_x = int(min(coords[:, 0].min(), 0))
+    origin_y = int(min(coords[:, 1].min(), 0))
+    width = int(coords[:, 2].max()) - origin_x + 1
+    height = int(coords[:, 3].max()) - origin_y + 1
+    return origin_x, origin_y, max(width, 1), max(height, 1)
+
+def _raster_lookup(raster, origin_x, origin_y, x, y):
+    col = int(np.floor(x)) - origin_x
+    row = int(np.floor(y)) - origin_y
+    if row < 0 or col < 0 or row >= raster.shape[0] or col >= raster.shape[1]:
+        return None
+    return raster[row, col]
+
+class ZoneIndex:
+    def __init__(self, zones, bbox_key="bbox_640"):
+        self.zone_ids = []
+        self.labels = None
+        self.origin_x = 0
+        self.origin_y = 0
+
+        boxes = []
+        for zone in zones:
+            bbox = zone.get(bbox_key, [])
+            if len(bbox) == 4:
+                boxes.append((zone["id"], _pixel_box(bbox)))
+
+        if not boxes:
+            return
+
+        self.origin_x, self.origin_y, width, height = _raster_extent([bbox for _, bbox in boxes])
+        self.labels = np.full((height, width), -1, dtype=np.int16)
+
+        for label in range(len(boxes) - 1, -1, -1):
+            zone_id, (x1, y1, x2, y2) = boxes[label]
+            if x2 < x1 or y2 < y1:
+                continue
+            self.labels[y1 - self.origin_y:y2 - self.origin_y + 1,
+                        x1 - self.origin_x:x2 - self.origin_x + 1] = label
+        self.zone_ids = [zone_id for zone_id, _ in boxes]
+
+        logging.debug(f"존 인덱스 생성: {len(boxes)}개 존, {width}x{height}")
+
+    def lookup(self, x, y, shift_x=0.0, shift_y=0.0):
+        if self.labels is None:
+            return None
+
+        label = _raster_lookup(self.labels, self.origin_x, self.origin_y, x - shift_x, y - shift_y)
+        if label is None or label < 0:
+            return None
+        return self.zone_ids[label]
+
+
+class RegionMap:
+    def __init__(self, map_config):
+        self.zone_index = ZoneIndex(map_config.get("zones", []))
+        self.flags = None
+        self.origin_x = 0
+        self.origin_y = 0
+
+        flag_boxes = []
+        for box in map_config.get("no_hunt_boxes", []):
+            if len(box) == 4:
+                flag_boxes.append((FLAG_NO_HUNT, _pixel_box(box)))
+        for box in map_config.get("no_teleport_boxes", []):
+            if len(box) == 4:
+                flag_boxes.append((FLAG_NO_TELEPORT, _pixel_box(box)))
+
+        if flag_boxes:
+            self.origin_x, self.origin_y, width, height = _raster_extent([bbox for _, bbox in flag_boxes])
+            self.flags = np.zeros((height, width), dtype=np.uint8)
+            for flag, (x1, y1, x2, y2) in flag_boxes:
+                if x2 < x1 or y2 < y1:
+                    continue
+                self.flags[y1 - self.origin_y:y2 - self.origin_y + 1,
+                           x1 - self.origin_x:x2 - self.origin_x + 1] |= flag
+
+        logging.info(f"🗺️ 영역 맵 생성: 존 {len(self.zone_index.zone_ids)}개, 제한 박스 {len(flag_boxes)}개")
+
+    def query(self, x, y, shift_x=0.0, shift_y=0.0):
+        zone = self.zone_index.lookup(x, y, shift_x, shift_y)
+
+        flags = 0
+        if self.flags is not None:
+            value = _raster_lookup(self.flags, self.origin_x, self.origin_y, x, y)
+            flags = int(value) if value is not None else 0
+
+        return RegionInfo(zone, bool(flags & FLAG_NO_HUNT), bool(flags & FLAG_NO_TELEPORT))
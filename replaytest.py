@@ -0,0 +1,122 @@
+import sys
+import time
+import json
+import os
+import logging
+from screen_capture import ScreenCapture
+from frame_source import ReplayFrameSource
+from yellow_dot_tracker import YellowDotTracker
+from scroll_tracker import ScrollTracker
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s',
+    datefmt='%H:%M:%S'
+)
+
+def load_map_config(map_id):
+    with open(os.path.join("configs", "maps.json"), "r", encoding="utf-8") as f:
+        maps_data = json.load(f)
+
+    for map_info in maps_data["maps"]:
+        if map_info["id"] == map_id:
+            with open(os.path.join("configs", map_info["config_file"]), "r", encoding="utf-8") as f:
+                return json.load(f), map_info
+
+    return None, None
+
+def main():
+    if len(sys.argv) < 3:
+        print("사용법: python replaytest.py <프레임 폴더|.npy|영상> <맵 id> [--fast] [--detector <캐릭터 모델>]")
+        return
+
+    replay_path = sys.argv[1]
+    map_id = sys.argv[2]
+    realtime = "--fast" not in sys.argv
+    character_model_path = None
+    if "--detector" in sys.argv:
+        character_model_path = sys.argv[sys.argv.index("--detector") + 1]
+
+    map_config, map_info = load_map_config(map_id)
+    if not map_config:
+        print(f"❌ 맵을 찾을 수 없습니다: {map_id}")
+        return
+
+    print("🎞️ 리플레이 파이프라인 벤치마크")
+    print("=" * 50)
+
+    frame_source = ReplayFrameSource(replay_path, realtime=realtime)
+    screen_capture = ScreenCapture(map_config.get("minimap", {}), frame_source=frame_source)
+
+    scroll_tracker = ScrollTracker()
+    scroll_tracker.update_map_config(map_config)
+    yellow_dot_tracker = YellowDotTracker(screen_capture, map_config, scroll_tracker)
+
+    detector_engine = None
+    if character_model_path:
+        from detector_engine import DetectorEngine
+        model_name = map_info.get("monstermodelname", map_id)
+        detector_engine = DetectorEngine({'width': 200, 'height': 50})
+        if not detector_engine.initialize(character_model_path, f"maple_models/{model_name}/model/{model_name}_best.engine"):
+            print("❌ 탐지 엔진 초기화 실패")
+            return
+
+    frame_reader = screen_capture.subscribe("replaytest")
+    if not screen_capture.start():
+        print("❌ 리플레이 시작 실패")
+        return
+
+    timings = {"scroll": 0.0, "yellow": 0.0, "detect": 0.0}
+    zone_frames = {}
+    frame_count = 0
+    start_time = time.perf_counter()
+
+    try:
+        while screen_capture.running or frame_reader.has_new():
+            frame = frame_reader.wait_next()
+            if frame is None or frame.minimap is None:
+                continue
+
+            main_frame = frame.main
+            minimap = frame.minimap
+
+            frame_count += 1
+
+            t0 = time.perf_counter()
+            if scroll_tracker.scroll_enabled:
+                scroll_tracker.detect_minimap_scroll(minimap)
+            t1 = time.perf_counter()
+            yellow_pos = yellow_dot_tracker.detect_yellow_dot(minimap)
+            zone = None
+            if yellow_pos:
+                zone = yellow_dot_tracker.query_region(
+                    int(yellow_pos[0] * yellow_dot_tracker.scale_to_640),
+                    int(yellow_pos[1] * yellow_dot_tracker.scale_to_640)
+                ).zone
+            zone_frames[zone] = zone_frames.get(zone, 0) + 1
+            t2 = time.perf_counter()
+            if detector_engine:
+                detector_engine.detect(main_frame)
+            t3 = time.perf_counter()
+
+            timings["scroll"] += t1 - t0
+            timings["yellow"] += t2 - t1
+            timings["detect"] += t3 - t2
+
+    except KeyboardInterrupt:
+        print("\n테스트 중단")
+    finally:
+        screen_capture.stop()
+
+    elapsed = time.perf_counter() - start_time
+    print("-" * 50)
+    print(f"처리 프레임: {frame_count}개 / {elapsed:.2f}초 ({frame_count / max(elapsed, 1e-6):.1f} fps, "
+          f"드랍 {frame_reader.dropped}개)")
+    for stage, total in timings.items():
+        print(f"  {stage}: 평균 {total / max(frame_count, 1) * 1000:.2f}ms")
+    print("존별 프레임:")
+    for zone, count in sorted(zone_frames.items(), key=lambda item: (item[0] is None, str(item[0]))):
+        print(f"  {zone if zone is not None else '없음'}: {count}개")
+
+if __name__ == "__main__":
+    main()
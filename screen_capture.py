@@ -1,52 +1,48 @@
 import threading
-import queue
 import time
-import mss
 import numpy as np
-import pygetwindow as gw
 import logging
 
+from frame_source import MssFrameSource
+from frame_bus import FrameBus, FrameEntry
+from frame_pacer import RateClock, stage_rates
+
 class ScreenCapture:
-    def __init__(self, minimap_info=None):
+    def __init__(self, minimap_info=None, single_grab=True, frame_pool_size=8, frame_source=None, target_fps=60):
         self.running = False
         self.thread = None
-        self.minimap_queue = queue.Queue(maxsize=5)
-        self.main_queue = queue.Queue(maxsize=5)
-        self.game_window = None
-        self._find_game_window()
+        self.frame_source = frame_source if frame_source is not None else MssFrameSource("Mapleland")
+        self.single_grab = single_grab
+        self.frame_pool_size = frame_pool_size
+        self.frame_bus = FrameBus(capacity=frame_pool_size)
+        self.target_fps = target_fps
+        self.consumer_readers = {}
+        self.frame_pool = []
+        self.frame_pool_index = 0
         self.update_minimap_info(minimap_info)
     
     def update_minimap_info(self, minimap_info):
-        if minimap_info:
-            self.minimap_left = minimap_info.get("left", 20)
-            self.minimap_top = minimap_info.get("top", 170)
-            self.minimap_width = minimap_info.get("width", 350)
-            self.minimap_height = minimap_info.get("height", 221)
-        else:
-            self.minimap_left = 20
-            self.minimap_top = 170
-            self.minimap_width = 350
-            self.minimap_height = 221
+        minimap_info = minimap_info or {}
+        self.minimap_rect = (
+            minimap_info.get("left", 20),
+            minimap_info.get("top", 170),
+            minimap_info.get("width", 350),
+            minimap_info.get("height", 221)
+        )
     
-    def _find_game_window(self):
-        wins = gw.getWindowsWithTitle("Mapleland")
-        if wins:
-            self.game_window = wins[0]
-            logging.info(f"✅ 게임 창 찾음: {self.game_window.width}x{self.game_window.height}")
-            logging.info(f"  → 위치: ({self.game_window.left}, {self.game_window.top})")
-        else:
-            logging.error("❌ Mapleland 창을 찾을 수 없습니다")
-            self.game_window = None
+    def is_current_minimap(self, entry):
+        return entry is not None and entry.minimap_rect == self.minimap_rect
     
     def start(self):
-        if not self.game_window:
-            logging.error("❌ 게임 창이 없어서 화면 캡처를 시작할 수 없습니다")
+        if not self.frame_source.is_available():
+            logging.error(f"❌ 프레임 소스({self.frame_source.name})를 사용할 수 없어 화면 캡처를 시작할 수 없습니다")
             return False
         
         self.running = True
+        self.frame_bus.reset()
         self.thread = threading.Thread(target=self._capture_loop, daemon=True)
         self.thread.start()
-        logging.info("📷 화면 캡처 스레드 시작")
+        logging.info(f"📷 화면 캡처 스레드 시작 (소스: {self.frame_source.name})")
         return True
     
     def stop(self):
@@ -55,65 +51,118 @@ class ScreenCapture:
             self.thread.join()
             logging.info("📷 화면 캡처 스레드 종료")
     
-    def get_minimap(self, timeout=0.1):
-        try:
-            return self.minimap_queue.get(timeout=timeout)
-        except queue.Empty:
+    def subscribe(self, name):
+        return self.frame_bus.subscribe(name)
+    
+    def get_drop_stats(self):
+        return self.frame_bus.get_drop_stats()
+    
+    def _get_consumer_reader(self, consumer, kind):
+        key = (consumer, kind)
+        reader = self.consumer_readers.get(key)
+        if reader is None:
+            reader = self.frame_bus.subscribe(f"{consumer}:{kind}")
+            self.consumer_readers[key] = reader
+        return reader
+    
+    def get_minimap(self, timeout=0.1, copy=True, consumer="default"):
+        entry = self._get_consumer_reader(consumer, "minimap").wait_next(timeout)
+        if entry is None or entry.minimap is None or not self.is_current_minimap(entry):
             return None
+        
+        if not copy:
+            return entry.minimap
+        minimap = entry.minimap.copy()
+        return minimap if self.frame_bus.is_live(entry) else None
     
-    def get_main_frame(self, timeout=0.1):
-        try:
-            return self.main_queue.get(timeout=timeout)
-        except queue.Empty:
+    def get_main_frame(self, timeout=0.1, copy=True, consumer="default"):
+        entry = self._get_consumer_reader(consumer, "main").wait_next(timeout)
+        if entry is None:
             return None
+        
+        if not copy:
+            return entry.main
+        main = entry.main.copy()
+        return main if self.frame_bus.is_live(entry) else None
     
-    def _capture_loop(self):
-        minimap_region = {
-            "left": self.game_window.left + self.minimap_left,
-            "top": self.game_window.top + self.minimap_top,
-            "width": self.minimap_width,
-            "height": self.minimap_height
-        }
+    def snapshot(self, newer_than=None, timeout=1.0):
+        deadline = time.time() + timeout
+        while True:
+            entry = self.frame_bus.latest()
+            if entry is not None and (newer_than is None or entry.timestamp > newer_than):
+                main = entry.main.copy()
+                minimap = entry.minimap.copy() if entry.minimap is not None else None
+                if self.frame_bus.is_live(entry):
+                    return FrameEntry(entry.seq, entry.timestamp, main, minimap, entry.minimap_rect)
+                continue
+            
+            remaining = deadline - time.time()
+            if remaining <= 0 or not self.running:
+                return None
+            self.frame_bus.wait_for(entry.seq if entry is not None else 0, remaining)
+    
+    def get_window_origin(self):
+        return self.frame_source.get_origin()
+    
+    def _minimap_inside_frame(self, frame_shape, minimap_rect):
+        frame_height, frame_width = frame_shape[:2]
+        left, top, width, height = minimap_rect
+        return (left >= 0 and top >= 0 and
+                left + width <= frame_width and
+                top + height <= frame_height)
+    
+    def _next_pool_buffer(self, height, width):
+        buffer_count = self.frame_bus.capacity + 1
+        if len(self.frame_pool) != buffer_count or self.frame_pool[0].shape[:2] != (height, width):
+            self.frame_pool = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(buffer_count)]
+            self.frame_pool_index = 0
+            logging.info(f"📷 프레임 버퍼 할당: {width}x{height} x {buffer_count}")
         
-        game_region = {
-            "left": self.game_window.left,
-            "top": self.game_window.top,
-            "width": self.game_window.width,
-            "height": self.game_window.height
-        }
+        buffer = self.frame_pool[self.frame_pool_index]
+        self.frame_pool_index = (self.frame_pool_index + 1) % buffer_count
+        return buffer
+    
+    def _read_frame(self):
+        buffer = None
+        if self.frame_source.frame_shape:
+            buffer = self._next_pool_buffer(*self.frame_source.frame_shape[:2])
+        return self.frame_source.read(buffer)
+    
+    def _capture_loop(self):
+        if not self.frame_source.open():
+            logging.error(f"❌ 프레임 소스({self.frame_source.name}) 열기 실패")
+            self.running = False
+            self.frame_bus.close()
+            return
         
         logging.info(f"📷 캡처 영역 설정 완료")
-        logging.info(f"  → 게임 영역: {game_region}")
-        logging.info(f"  → 미니맵 영역: {minimap_region}")
+        left, top, width, height = self.minimap_rect
+        logging.info(f"  → 미니맵 영역: left={left}, top={top}, {width}x{height}")
+        logging.info(f"  → 캡처 모드: {'단일 캡처' if self.single_grab else '개별 캡처'}")
         
         frame_count = 0
+        clock = RateClock(self.target_fps)
+        capture_rate = stage_rates.get("capture")
         
-        with mss.mss() as sct:
+        try:
             while self.running:
                 try:
-                    minimap_shot = sct.grab(minimap_region)
-                    minimap_frame = np.array(minimap_shot)[:, :, :3].copy()
-                    
-                    main_shot = sct.grab(game_region)
-                    main_frame = np.array(main_shot)[:, :, :3].copy()
+                    main_frame = self._read_frame()
+                    if main_frame is None:
+                        logging.info("📷 프레임 소스 종료")
+                        self.running = False
+                        break
                     
-                    try:
-                        self.minimap_queue.put_nowait(minimap_frame)
-                    except queue.Full:
-                        try:
-                            self.minimap_queue.get_nowait()
-                            self.minimap_queue.put_nowait(minimap_frame)
-                        except:
-                            pass
+                    minimap_rect = self.minimap_rect
+                    left, top, width, height = minimap_rect
+                    minimap_frame = None
+                    if self.single_grab and self._minimap_inside_frame(main_frame.shape, minimap_rect):
+                        minimap_frame = main_frame[top:top + height, left:left + width]
+                    else:
+                        minimap_frame = self.frame_source.grab_region(left, top, width, height)
                     
-                    try:
-                        self.main_queue.put_nowait(main_frame)
-                    except queue.Full:
-                        try:
-                            self.main_queue.get_nowait()
-                            self.main_queue.put_nowait(main_frame)
-                        except:
-                            pass
+                    self.frame_bus.publish(main_frame, minimap_frame, time.time(), minimap_rect)
+                    capture_rate.tick()
                     
                     frame_count += 1
                     if frame_count == 1:
@@ -122,6 +171,12 @@ class ScreenCapture:
                 except Exception as e:
                     logging.error(f"캡처 오류: {e}")
                 
-                time.sleep(0.016)
+                if not self.frame_source.self_paced:
+                    clock.wait()
+        finally:
+            self.frame_source.close()
+            self.frame_bus.close()
         
-        logging.info(f"📷 캡처 스레드 종료 (총 {frame_count}개 프레임 캡처)")
\ No newline at end of file
+        logging.info(f"📷 캡처 스레드 종료 (총 {frame_count}개 프레임 캡처)")
+        for name, stats in self.frame_bus.get_drop_stats().items():
+            logging.info(f"  → {name}: 수신 {stats['received']}개, 드랍 {stats['dropped']}개")
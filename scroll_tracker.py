@@ -3,6 +3,11 @@ import numpy as np
 import time
 import logging
 import os
+import threading
+
+from template_matcher import TemplateMatcher, top_k_peaks
+from template_store import template_store
+from phase_scroll import PhaseScrollEstimator
 
 class ScrollTracker:
     def __init__(self):
@@ -15,36 +20,64 @@ class ScrollTracker:
         self.tracking_files = []
         self.scale_to_640 = 1.0
         self.active_template_index = 0
+        self.matcher = TemplateMatcher()
+        self.landmark_threshold = 0.6
+        self.local_search = True
+        self.reacquire_interval = 1.0
+        self.last_reacquire_time = 0
+        self.tracked_landmarks_list = []
+        self.phase_anchor_offsets = []
+        self.scroll_method = "landmark"
+        self.phase_estimator = PhaseScrollEstimator()
+        self.scroll_confidence = 0.0
+        self.lock = threading.RLock()
         
     def update_map_config(self, map_config):
-        self.scroll_enabled = map_config.get("scroll_enabled", False)
-        
-        if "scroll_tracking_files" in map_config:
-            self.tracking_files = map_config.get("scroll_tracking_files", [])
-        elif "scroll_tracking_file" in map_config:
-            tracking_file = map_config.get("scroll_tracking_file", "")
-            self.tracking_files = [tracking_file] if tracking_file else []
-        else:
-            self.tracking_files = []
-        
-        minimap_info = map_config.get("minimap", {})
-        self.scale_to_640 = minimap_info.get("scale_to_640", 1.0)
+        with self.lock:
+            self.scroll_enabled = map_config.get("scroll_enabled", False)
+            
+            if "scroll_tracking_files" in map_config:
+                self.tracking_files = map_config.get("scroll_tracking_files", [])
+            elif "scroll_tracking_file" in map_config:
+                tracking_file = map_config.get("scroll_tracking_file", "")
+                self.tracking_files = [tracking_file] if tracking_file else []
+            else:
+                self.tracking_files = []
+            
+            minimap_info = map_config.get("minimap", {})
+            self.scale_to_640 = minimap_info.get("scale_to_640", 1.0)
+            self.local_search = map_config.get("scroll_local_search", True)
+            self.reacquire_interval = map_config.get("scroll_reacquire_interval", 1.0)
+            self.scroll_method = map_config.get("scroll_method", "landmark")
+            self.phase_estimator = PhaseScrollEstimator(
+                min_confidence=map_config.get("scroll_phase_min_confidence", 0.2),
+                max_step=50 / self.scale_to_640
+            )
+            
+            if self.scroll_enabled and self.scroll_method == "phase":
+                if self.tracking_files:
+                    self.load_landmark_templates()
+                else:
+                    self.landmark_templates = []
+                self.reset_scroll_tracking()
+                logging.info(f"📜 스크롤 추적 활성화: 위상 상관 방식 (랜드마크 보정 {len(self.landmark_templates)}개)")
+            elif self.scroll_enabled and self.tracking_files:
+                self.load_landmark_templates()
+                self.reset_scroll_tracking()
+                logging.info(f"📜 스크롤 추적 활성화: {len(self.landmark_templates)}개 템플릿")
+            else:
+                logging.info("📜 스크롤 추적 비활성화")
         
-        if self.scroll_enabled and self.tracking_files:
-            self.load_landmark_templates()
-            self.reset_scroll_tracking()
-            logging.info(f"📜 스크롤 추적 활성화: {len(self.landmark_templates)}개 템플릿")
-        else:
-            logging.info("📜 스크롤 추적 비활성화")
-    
     def load_landmark_templates(self):
         self.landmark_templates = []
+        self.matcher.remove("landmark")
         
         for i, filename in enumerate(self.tracking_files):
             if os.path.exists(filename):
-                template = cv2.imread(filename, cv2.IMREAD_COLOR)
+                template = template_store.get(filename)
                 if template is not None:
                     self.landmark_templates.append(template)
+                    self.matcher.add_file("landmark", filename, threshold=self.landmark_threshold, pyramid=False)
                     h, w = template.shape[:2]
                     logging.info(f"🏔️ 랜드마크 템플릿 {i+1} 로드: {filename} {w}x{h}")
                 else:
@@ -54,16 +87,31 @@ class ScrollTracker:
         
         self.previous_landmarks_list = [[] for _ in self.landmark_templates]
         self.initial_landmarks_list = [[] for _ in self.landmark_templates]
+        self.tracked_landmarks_list = [[] for _ in self.landmark_templates]
+        self.phase_anchor_offsets = [None for _ in self.landmark_templates]
     
     def reset_scroll_tracking(self):
-        self.scroll_offset = {"x": 0, "y": 0}
-        self.previous_landmarks_list = [[] for _ in self.landmark_templates]
-        self.initial_landmarks_list = [[] for _ in self.landmark_templates]
-        self.last_position_reset_time = time.time()
-        self.active_template_index = 0
-        logging.info("📜 스크롤 오프셋 초기화")
+        with self.lock:
+            self.scroll_offset = {"x": 0, "y": 0}
+            self.previous_landmarks_list = [[] for _ in self.landmark_templates]
+            self.initial_landmarks_list = [[] for _ in self.landmark_templates]
+            self.tracked_landmarks_list = [[] for _ in self.landmark_templates]
+            self.phase_anchor_offsets = [None for _ in self.landmark_templates]
+            self.last_reacquire_time = 0
+            self.last_position_reset_time = time.time()
+            self.active_template_index = 0
+            self.phase_estimator.reset()
+            self.scroll_confidence = 0.0
+            logging.info("📜 스크롤 오프셋 초기화")
+        
+    def detect_minimap_scroll(self, minimap_frame, dot_mask=None):
+        with self.lock:
+            return self._detect_minimap_scroll(minimap_frame, dot_mask)
     
-    def detect_minimap_scroll(self, minimap_frame):
+    def _detect_minimap_scroll(self, minimap_frame, dot_mask=None):
+        if self.scroll_enabled and self.scroll_method == "phase":
+            return self._detect_phase_scroll(minimap_frame, dot_mask)
+        
         if not self.scroll_enabled or not self.landmark_templates:
             return {"x": 0, "y": 0}
         
@@ -73,8 +121,23 @@ class ScrollTracker:
             current_landmarks_list = []
             valid_template_indices = []
             
+            reacquire = (not self.local_search or
+                         current_time - self.last_reacquire_time >= self.reacquire_interval)
+            if reacquire:
+                self.last_reacquire_time = current_time
+            
             for i, template in enumerate(self.landmark_templates):
-                landmarks = self.find_landmarks_in_minimap(minimap_frame, template)
+                landmarks = None
+                tracked = self.tracked_landmarks_list[i] if i < len(self.tracked_landmarks_list) else []
+                if not reacquire and tracked:
+                    landmarks = self.find_landmarks_near(minimap_frame, i, tracked)
+                    if len(landmarks) * 2 < len(tracked):
+                        landmarks = None
+                if landmarks is None:
+                    landmarks = self.find_landmarks_in_minimap(minimap_frame, i)
+                
+                if i < len(self.tracked_landmarks_list):
+                    self.tracked_landmarks_list[i] = landmarks
                 current_landmarks_list.append(landmarks)
                 if landmarks:
                     valid_template_indices.append(i)
@@ -136,6 +199,40 @@ class ScrollTracker:
             logging.error(f"스크롤 감지 오류: {e}")
             return {"x": 0, "y": 0}
     
+    def _detect_phase_scroll(self, minimap_frame, dot_mask=None):
+        try:
+            delta = self.phase_estimator.update(minimap_frame, dot_mask)
+            self.scroll_confidence = delta["confidence"]
+            
+            current_time = time.time()
+            if self.landmark_templates and current_time - self.last_reacquire_time >= self.reacquire_interval:
+                self.last_reacquire_time = current_time
+                self._reacquire_phase_offset(minimap_frame)
+            
+            self.scroll_offset = {"x": self.phase_estimator.offset["x"], "y": self.phase_estimator.offset["y"]}
+            return {"x": delta["x"], "y": delta["y"]}
+        except Exception as e:
+            logging.error(f"위상 상관 스크롤 감지 오류: {e}")
+            return {"x": 0, "y": 0}
+    
+    def _reacquire_phase_offset(self, minimap_frame):
+        for idx in range(len(self.landmark_templates)):
+            landmarks = self.find_landmarks_in_minimap(minimap_frame, idx)
+            if not landmarks:
+                continue
+            
+            if not self.initial_landmarks_list[idx]:
+                self.initial_landmarks_list[idx] = [f.copy() for f in landmarks]
+                self.phase_anchor_offsets[idx] = (self.phase_estimator.offset["x"], self.phase_estimator.offset["y"])
+                continue
+            
+            offset = self.calculate_offset_from_initial(self.initial_landmarks_list[idx], landmarks)
+            if offset:
+                anchor_x, anchor_y = self.phase_anchor_offsets[idx]
+                self.phase_estimator.correct(anchor_x + offset["x"], anchor_y + offset["y"])
+                return True
+        return False
+    
     def calculate_offset_from_initial(self, initial_landmarks, current_landmarks):
         matches = []
         match_distance = 150 / self.scale_to_640
@@ -208,8 +305,9 @@ class ScrollTracker:
         
         return {"x": scroll_x, "y": scroll_y}
     
-    def find_landmarks_in_minimap(self, frame, template):
-        if template is None:
+    def find_landmarks_in_minimap(self, frame, template_index):
+        template_size = self.matcher.template_size("landmark", template_index)
+        if template_size is None:
             return []
         
         try:
@@ -220,53 +318,90 @@ class ScrollTracker:
                 frame = np.asarray(frame, dtype=np.uint8)
             
             landmarks = []
-            template_h, template_w = template.shape[:2]
+            template_w, template_h = template_size
             
             if frame.shape[0] < template_h or frame.shape[1] < template_w:
                 return []
             
-            result = cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
-            threshold = 0.6
-            locations = np.where(result >= threshold)
+            result, _, _ = self.matcher.response(frame, "landmark", template_index)
+            if result is None:
+                return []
+            threshold = self.landmark_threshold
+            suppress = max(1, int(np.ceil(30 / self.scale_to_640)) - 1)
             
-            y_coords, x_coords = locations
-            for i in range(len(x_coords)):
-                x, y = int(x_coords[i]), int(y_coords[i])
+            for confidence, (x, y) in top_k_peaks(result, 5, suppress, suppress):
+                if confidence < threshold:
+                    break
                 
-                if 0 <= y < result.shape[0] and 0 <= x < result.shape[1]:
-                    center_x = int(np.clip(x + template_w // 2, 0, frame.shape[1] - 1))
-                    center_y = int(np.clip(y + template_h // 2, 0, frame.shape[0] - 1))
-                    confidence = float(result[y, x])
-                    
-                    is_duplicate = False
-                    duplicate_distance = 30 / self.scale_to_640
-                    for existing in landmarks:
-                        ex_cx, ex_cy = existing["center"]
-                        if abs(ex_cx - center_x) < duplicate_distance and abs(ex_cy - center_y) < duplicate_distance:
-                            if confidence > existing["confidence"]:
-                                existing["center"] = [center_x, center_y]
-                                existing["confidence"] = confidence
-                            is_duplicate = True
-                            break
-                    
-                    if not is_duplicate:
-                        landmarks.append({
-                            "center": [center_x, center_y],
-                            "confidence": confidence,
-                            "bbox": [x, y, x + template_w, y + template_h]
-                        })
+                center_x = int(np.clip(x + template_w // 2, 0, frame.shape[1] - 1))
+                center_y = int(np.clip(y + template_h // 2, 0, frame.shape[0] - 1))
+                landmarks.append({
+                    "center": [center_x, center_y],
+                    "confidence": float(confidence),
+                    "bbox": [x, y, x + template_w, y + template_h]
+                })
             
-            landmarks.sort(key=lambda p: p["confidence"], reverse=True)
-            
-            return landmarks[:5]
+            return landmarks
             
         except Exception as e:
             logging.error(f"랜드마크 검색 오류: {e}")
             return []
     
+    def find_landmarks_near(self, frame, template_index, tracked_landmarks):
+        template_size = self.matcher.template_size("landmark", template_index)
+        if template_size is None or frame is None or frame.size == 0:
+            return []
+        
+        try:
+            template_w, template_h = template_size
+            frame_h, frame_w = frame.shape[:2]
+            radius = int(np.ceil(50 / self.scale_to_640)) + 2
+            duplicate_distance = 30 / self.scale_to_640
+            landmarks = []
+            
+            for tracked in tracked_landmarks:
+                x, y = tracked["bbox"][:2]
+                x1, y1 = max(0, x - radius), max(0, y - radius)
+                x2 = min(frame_w, x + template_w + radius)
+                y2 = min(frame_h, y + template_h + radius)
+                if x2 - x1 < template_w or y2 - y1 < template_h:
+                    continue
+                
+                result, _, _ = self.matcher.response(frame[y1:y2, x1:x2], "landmark", template_index)
+                if result is None:
+                    continue
+                
+                _, confidence, _, max_loc = cv2.minMaxLoc(result)
+                if confidence < self.landmark_threshold:
+                    continue
+                
+                found_x, found_y = max_loc[0] + x1, max_loc[1] + y1
+                center_x = int(np.clip(found_x + template_w // 2, 0, frame_w - 1))
+                center_y = int(np.clip(found_y + template_h // 2, 0, frame_h - 1))
+                
+                if any(abs(l["center"][0] - center_x) < duplicate_distance and
+                       abs(l["center"][1] - center_y) < duplicate_distance for l in landmarks):
+                    continue
+                
+                landmarks.append({
+                    "center": [center_x, center_y],
+                    "confidence": float(confidence),
+                    "bbox": [found_x, found_y, found_x + template_w, found_y + template_h]
+                })
+            
+            landmarks.sort(key=lambda p: p["confidence"], reverse=True)
+            return landmarks
+            
+        except Exception as e:
+            logging.error(f"랜드마크 국소 검색 오류: {e}")
+            return []
+    
     def get_current_scroll_offset(self):
         return self.scroll_offset.copy()
     
+    def get_scroll_confidence(self):
+        return self.scroll_confidence
+    
     def get_active_landmarks_count(self):
         if self.active_template_index < len(self.initial_landmarks_list):
             return len(self.initial_landmarks_list[self.active_template_index])
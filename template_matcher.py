@@ -0,0 +1,325 @@
+import cv2
+import numpy as np
+import logging
+
+from batch_matcher import BatchTemplateMatcher
+from template_store import template_store
+from constants import TEMPLATE_MATCH_THRESHOLD, TEMPLATE_PYRAMID_SCALE, TEMPLATE_PYRAMID_TOP_K, TEMPLATE_MATCH_CONFIG
+
+MATCH_MODES = ("bgr", "gray", "edge")
+
+def convert_for_mode(image, mode):
+    if mode == "bgr" or image.ndim == 2:
+        if mode == "edge":
+            return cv2.Canny(image, 50, 150)
+        return image
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    if mode == "edge":
+        return cv2.Canny(gray, 50, 150)
+    return gray
+
+def crop_roi(image, roi):
+    if roi is None:
+        return image, 0, 0
+
+    h, w = image.shape[:2]
+    x1, y1, x2, y2 = roi
+    x1, y1 = max(0, int(x1)), max(0, int(y1))
+    x2, y2 = min(w, int(x2)), min(h, int(y2))
+    return image[y1:y2, x1:x2], x1, y1
+
+def top_k_peaks(result, k, suppress_w, suppress_h):
+    result = result.copy()
+    peaks = []
+    for _ in range(k):
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if max_val <= -1.0:
+            break
+        peaks.append((max_val, max_loc))
+        x, y = max_loc
+        result[max(0, y - suppress_h):y + suppress_h + 1, max(0, x - suppress_w):x + suppress_w + 1] = -1.0
+    return peaks
+
+
+class TemplateEntry:
+    def __init__(self, template, roi=None, mode="bgr", threshold=TEMPLATE_MATCH_THRESHOLD, pyramid_scale=None,
+                 stats=None):
+        if mode not in MATCH_MODES:
+            logging.warning(f"⚠️ 알 수 없는 매칭 모드: {mode} - bgr 사용")
+            mode = "bgr"
+
+        self.roi = roi
+        self.mode = mode
+        self.threshold = threshold
+        self.stats = stats
+        self.image = convert_for_mode(template, mode)
+        self.h, self.w = self.image.shape[:2]
+
+        self.coarse_image = None
+        if pyramid_scale:
+            coarse_w = int(self.w * pyramid_scale)
+            coarse_h = int(self.h * pyramid_scale)
+            if coarse_w >= 8 and coarse_h >= 8:
+                self.coarse_image = cv2.resize(self.image, (coarse_w, coarse_h), interpolation=cv2.INTER_AREA)
+
+
+class TemplateMatcher:
+    def __init__(self, pyramid_scale=TEMPLATE_PYRAMID_SCALE, top_k=TEMPLATE_PYRAMID_TOP_K, coarse_margin=0.2,
+                 batch_min_size=2):
+        self.pyramid_scale = pyramid_scale
+        self.top_k = top_k
+        self.coarse_margin = coarse_margin
+        self.batch_min_size = batch_min_size
+        self.entries = {}
+        self._batches = {}
+        self._sources = {}
+        self._store_generation = template_store.generation
+        self._frame_cache = {}
+        self._cached_frame = None
+
+    def add(self, name, template, roi=None, mode="bgr", threshold=TEMPLATE_MATCH_THRESHOLD, pyramid=True,
+            stats=None):
+        if template is None:
+            return
+        entry = TemplateEntry(template, roi, mode, threshold, self.pyramid_scale if pyramid else None, stats)
+        self.entries.setdefault(name, []).append(entry)
+        self._batches.pop(name, None)
+
+    def add_configured(self, name, template, config_name=None):
+        self.add(name, template, **self._config_options(config_name or name))
+
+    def _config_options(self, config_name):
+        config = TEMPLATE_MATCH_CONFIG.get(config_name, {})
+        return {
+            "roi": config.get("roi"),
+            "mode": config.get("mode", "bgr"),
+            "threshold": config.get("threshold", TEMPLATE_MATCH_THRESHOLD),
+            "pyramid": config.get("pyramid", True)
+        }
+
+    def add_file(self, name, path, **options):
+        self._sources.setdefault(name, []).append(("file", path, options))
+        self._load_source(name, "file", path, options)
+        return self.has(name)
+
+    def add_folder(self, name, folder, **options):
+        self._sources.setdefault(name, []).append(("folder", folder, options))
+        self._load_source(name, "folder", folder, options)
+        return self.has(name)
+
+    def add_configured_file(self, name, path, config_name=None):
+        return self.add_file(name, path, **self._config_options(config_name or name))
+
+    def add_configured_folder(self, name, folder, config_name=None):
+        return self.add_folder(name, folder, **self._config_options(config_name or name))
+
+    def _load_source(self, name, kind, value, options):
+        paths = template_store.list_folder(value) if kind == "folder" else [value]
+        mode = options.get("mode", "bgr")
+        for path in paths:
+            template = template_store.get_gray(path) if mode == "gray" else template_store.get(path)
+            stats = template_store.get_stats(path, gray=mode == "gray") if mode != "edge" else None
+            self.add(name, template, stats=stats, **options)
+
+    def _sync(self):
+        template_store.refresh()
+        if self._store_generation == template_store.generation:
+            return
+
+        self._store_generation = template_store.generation
+        for name, sources in self._sources.items():
+            self.entries[name] = []
+            self._batches.pop(name, None)
+            for kind, value, options in sources:
+                self._load_source(name, kind, value, options)
+            logging.info(f"🔄 템플릿 재적용: {name} ({len(self.entries[name])}개)")
+
+    def remove(self, name):
+        self.entries.pop(name, None)
+        self._sources.pop(name, None)
+        self._batches.pop(name, None)
+
+    def has(self, name):
+        self._sync()
+        return bool(self.entries.get(name))
+
+    def names(self):
+        return list(self.entries.keys())
+
+    def template_size(self, name, index=0):
+        self._sync()
+        entries = self.entries.get(name, [])
+        if index >= len(entries):
+            return None
+        return entries[index].w, entries[index].h
+
+    def set_frame(self, frame):
+        self._cached_frame = frame
+        self._frame_cache = {}
+
+    def _prepare(self, frame, roi, mode, coarse):
+        use_cache = frame is self._cached_frame
+        key = (roi, mode, coarse)
+        if use_cache:
+            cached = self._frame_cache.get(key)
+            if cached is not None:
+                return cached
+
+        if coarse:
+            image, offset_x, offset_y = self._prepare(frame, roi, mode, False)
+            image = cv2.resize(image, None, fx=self.pyramid_scale, fy=self.pyramid_scale,
+                               interpolation=cv2.INTER_AREA)
+            cached = (image, offset_x, offset_y)
+        else:
+            image, offset_x, offset_y = crop_roi(frame, roi)
+            cached = (convert_for_mode(image, mode), offset_x, offset_y)
+
+        if use_cache:
+            self._frame_cache[key] = cached
+        return cached
+
+    def _get_batches(self, name):
+        batches = self._batches.get(name)
+        if batches is not None:
+            return batches
+
+        groups = {}
+        for index, entry in enumerate(self.entries.get(name, [])):
+            coarse = entry.coarse_image is not None
+            groups.setdefault((entry.roi, entry.mode, coarse), []).append(index)
+
+        batches = []
+        for (roi, mode, coarse), indices in groups.items():
+            if len(indices) < self.batch_min_size:
+                continue
+            entries = self.entries[name]
+            templates = [entries[i].coarse_image if coarse else entries[i].image for i in indices]
+            stats = None if coarse else [entries[i].stats for i in indices]
+            batches.append((roi, mode, coarse, indices, BatchTemplateMatcher(templates, stats)))
+
+        self._batches[name] = batches
+        return batches
+
+    def _batch_responses(self, frame, name):
+        use_cache = frame is self._cached_frame
+        if use_cache and ("batch", name) in self._frame_cache:
+            return self._frame_cache[("batch", name)]
+
+        responses = {}
+        for roi, mode, coarse, indices, batch in self._get_batches(name):
+            try:
+                image, _, _ = self._prepare(frame, roi, mode, coarse)
+                for index, result in zip(indices, batch.match(image)):
+                    if result is not None:
+                        responses[index] = result
+            except Exception as e:
+                logging.error(f"배치 템플릿 매칭 오류 ({name}): {e}")
+
+        if use_cache:
+            self._frame_cache[("batch", name)] = responses
+        return responses
+
+    def _match_entry(self, frame, entry, response=None):
+        image, offset_x, offset_y = self._prepare(frame, entry.roi, entry.mode, False)
+        if image.shape[0] < entry.h or image.shape[1] < entry.w:
+            return 0.0, None
+
+        if entry.coarse_image is None:
+            result = response if response is not None else cv2.matchTemplate(image, entry.image, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            return max_val, (max_loc[0] + offset_x, max_loc[1] + offset_y)
+
+        coarse, _, _ = self._prepare(frame, entry.roi, entry.mode, True)
+        coarse_h, coarse_w = entry.coarse_image.shape[:2]
+        if coarse.shape[0] < coarse_h or coarse.shape[1] < coarse_w:
+            return 0.0, None
+
+        coarse_result = response
+        if coarse_result is None:
+            coarse_result = cv2.matchTemplate(coarse, entry.coarse_image, cv2.TM_CCOEFF_NORMED)
+        peaks = top_k_peaks(coarse_result, self.top_k, coarse_w // 2, coarse_h // 2)
+
+        best_val, best_loc = 0.0, None
+        margin = int(np.ceil(1.0 / self.pyramid_scale)) * 2
+        for coarse_val, (cx, cy) in peaks:
+            if coarse_val < entry.threshold - self.coarse_margin:
+                break
+
+            x = int(cx / self.pyramid_scale)
+            y = int(cy / self.pyramid_scale)
+            x1, y1 = max(0, x - margin), max(0, y - margin)
+            x2 = min(image.shape[1], x + entry.w + margin)
+            y2 = min(image.shape[0], y + entry.h + margin)
+            window = image[y1:y2, x1:x2]
+            if window.shape[0] < entry.h or window.shape[1] < entry.w:
+                continue
+
+            result = cv2.matchTemplate(window, entry.image, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            if max_val > best_val:
+                best_val = max_val
+                best_loc = (max_loc[0] + x1 + offset_x, max_loc[1] + y1 + offset_y)
+
+        return best_val, best_loc
+
+    def match(self, frame, name):
+        best_val, best_loc = 0.0, None
+        if frame is None:
+            return best_val, best_loc
+
+        self._sync()
+        responses = self._batch_responses(frame, name)
+        for index, entry in enumerate(self.entries.get(name, [])):
+            try:
+                max_val, max_loc = self._match_entry(frame, entry, responses.get(index))
+            except Exception as e:
+                logging.error(f"템플릿 매칭 오류 ({name}): {e}")
+                continue
+            if max_val > best_val:
+                best_val, best_loc = max_val, max_loc
+        return best_val, best_loc
+
+    def is_match(self, frame, name):
+        if frame is None:
+            return False
+
+        self._sync()
+        responses = self._batch_responses(frame, name)
+        for index, entry in enumerate(self.entries.get(name, [])):
+            try:
+                max_val, _ = self._match_entry(frame, entry, responses.get(index))
+            except Exception as e:
+                logging.error(f"템플릿 매칭 오류 ({name}): {e}")
+                continue
+            if max_val >= entry.threshold:
+                return True
+        return False
+
+    def find(self, frame, name):
+        if frame is None:
+            return None
+
+        self._sync()
+        responses = self._batch_responses(frame, name)
+        for index, entry in enumerate(self.entries.get(name, [])):
+            try:
+                max_val, max_loc = self._match_entry(frame, entry, responses.get(index))
+            except Exception as e:
+                logging.error(f"템플릿 매칭 오류 ({name}): {e}")
+                continue
+            if max_val >= entry.threshold:
+                return max_val, max_loc, (entry.w, entry.h)
+        return None
+
+    def response(self, frame, name, index=0):
+        self._sync()
+        entries = self.entries.get(name, [])
+        if frame is None or index >= len(entries):
+            return None, 0, 0
+
+        entry = entries[index]
+        image, offset_x, offset_y = self._prepare(frame, entry.roi, entry.mode, False)
+        if image.shape[0] < entry.h or image.shape[1] < entry.w:
+            return None, offset_x, offset_y
+        return cv2.matchTemplate(image, entry.image, cv2.TM_CCOEFF_NORMED), offset_x, offset_y
@@ -0,0 +1,113 @@
+import os
+import glob
+import time
+import threading
+import logging
+import cv2
+import numpy as np
+
+IMAGE_PATTERNS = ('*.png', '*.jpg', '*.jpeg', '*.bmp')
+
+class TemplateStore:
+    def __init__(self, check_interval=2.0):
+        self.check_interval = check_interval
+        self.generation = 0
+        self._images = {}
+        self._mtimes = {}
+        self._variants = {}
+        self._folders = {}
+        self._last_check = 0
+        self._lock = threading.RLock()
+
+    def _mtime(self, path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def get(self, path):
+        with self._lock:
+            if path in self._images:
+                return self._images[path]
+
+            image = None
+            mtime = self._mtime(path)
+            if mtime is not None:
+                image = cv2.imread(path, cv2.IMREAD_COLOR)
+                if image is None:
+                    logging.warning(f"⚠️ 템플릿 로드 실패: {path}")
+                else:
+                    logging.info(f"✅ 템플릿 로드: {path}")
+
+            self._images[path] = image
+            self._mtimes[path] = mtime
+            return image
+
+    def get_gray(self, path):
+        return self._variant(path, "gray", lambda image: cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+
+    def get_stats(self, path, gray=False):
+        def build(image):
+            if gray:
+                image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            channels = image.reshape(-1, 1 if image.ndim == 2 else image.shape[2]).astype(np.float32)
+            mean = channels.mean(axis=0)
+            zero_mean = channels - mean
+            return {"mean": mean, "norm": float(np.sqrt((zero_mean * zero_mean).sum()))}
+        return self._variant(path, ("stats", gray), build)
+
+    def _variant(self, path, key, build):
+        with self._lock:
+            cached = self._variants.get((path, key))
+            if cached is not None:
+                return cached
+
+            image = self.get(path)
+            if image is None:
+                return None
+
+            variant = build(image)
+            self._variants[(path, key)] = variant
+            return variant
+
+    def list_folder(self, folder, patterns=IMAGE_PATTERNS):
+        with self._lock:
+            paths = []
+            if os.path.isdir(folder):
+                for pattern in patterns:
+                    paths.extend(glob.glob(os.path.join(folder, pattern)))
+            self._folders[(folder, patterns)] = sorted(paths)
+            return self._folders[(folder, patterns)]
+
+    def refresh(self, force=False):
+        now = time.time()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+
+        changed = []
+        with self._lock:
+            for path, mtime in list(self._mtimes.items()):
+                if self._mtime(path) != mtime:
+                    changed.append(path)
+
+            for (folder, patterns), paths in list(self._folders.items()):
+                previous = paths
+                if self.list_folder(folder, patterns) != previous:
+                    changed.append(folder)
+
+            for path in changed:
+                self._images.pop(path, None)
+                self._mtimes.pop(path, None)
+                for key in [key for key in self._variants if key[0] == path]:
+                    self._variants.pop(key)
+
+            if changed:
+                self.generation += 1
+
+        for path in changed:
+            logging.info(f"🔄 템플릿 변경 감지: {path}")
+        return bool(changed)
+
+
+template_store = TemplateStore()
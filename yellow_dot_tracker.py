@@ -3,21 +3,28 @@ import numpy as np
 import threading
 import time
 import logging
-from constants import YELLOW_DOT_RANGE
+from minimap_analyzer import minimap_analyzer
+from frame_pacer import stage_rates
+from region_index import RegionMap
 
 class YellowDotTracker:
     def __init__(self, screen_capture, map_config, scroll_tracker=None):
         self.screen_capture = screen_capture
+        self.frame_reader = screen_capture.subscribe("yellow_dot")
         self.scroll_tracker = scroll_tracker
         self.running = False
         self.thread = None
         self.current_zone = None
         self.yellow_dot_pos = None
+        self.region_info = None
         self.lock = threading.Lock()
         self.update_map_config(map_config)
     
     def update_map_config(self, map_config):
         self.zones = map_config.get("zones", [])
+        self.region_map = RegionMap(map_config)
+        with self.lock:
+            self.region_info = None
         self.minimap_info = map_config.get("minimap", {})
         self.scale_to_640 = self.minimap_info.get("scale_to_640", 1.0)
         logging.info(f"노란점 추적기 맵 업데이트: {len(self.zones)}개 존")
@@ -41,72 +48,63 @@ class YellowDotTracker:
         with self.lock:
             return self.yellow_dot_pos
     
+    def get_region_info(self):
+        with self.lock:
+            return self.region_info
+    
     def _track_loop(self):
+        track_rate = stage_rates.get("yellow_dot")
         while self.running:
             try:
-                minimap = self.screen_capture.get_minimap()
-                if minimap is None:
-                    time.sleep(0.016)
+                frame = self.frame_reader.wait_next()
+                if frame is None or frame.minimap is None:
+                    continue
+                if not self.screen_capture.is_current_minimap(frame):
                     continue
                 
+                minimap = frame.minimap
+                track_rate.tick()
+                
+                analysis = minimap_analyzer.analyze_frame(frame)
+                
                 if self.scroll_tracker and self.scroll_tracker.scroll_enabled:
-                    self.scroll_tracker.detect_minimap_scroll(minimap)
+                    self.scroll_tracker.detect_minimap_scroll(minimap, analysis.mask)
                 
-                yellow_pos = self._detect_yellow_dot(minimap)
+                yellow_pos = self._yellow_dot_from_analysis(analysis)
                 if yellow_pos:
                     x_640 = int(yellow_pos[0] * self.scale_to_640)
                     y_640 = int(yellow_pos[1] * self.scale_to_640)
                     
-                    zone = self._get_zone_at_position(x_640, y_640)
+                    region = self.query_region(x_640, y_640)
                     
                     with self.lock:
                         self.yellow_dot_pos = (x_640, y_640)
-                        if self.current_zone != zone:
-                            logging.debug(f"Zone 변경: {self.current_zone} → {zone}")
-                        self.current_zone = zone
+                        self.region_info = region
+                        if self.current_zone != region.zone:
+                            logging.debug(f"Zone 변경: {self.current_zone} → {region.zone}")
+                        self.current_zone = region.zone
                 
             except Exception as e:
                 logging.error(f"노란점 추적 오류: {e}")
-            
-            time.sleep(0.016)
     
-    def _detect_yellow_dot(self, minimap):
-        hsv = cv2.cvtColor(minimap, cv2.COLOR_BGR2HSV)
-        
-        lower_yellow = np.array(YELLOW_DOT_RANGE["lower"])
-        upper_yellow = np.array(YELLOW_DOT_RANGE["upper"])
-        
-        mask = cv2.inRange(hsv, lower_yellow, upper_yellow)
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        if contours:
-            largest = max(contours, key=cv2.contourArea)
-            M = cv2.moments(largest)
-            if M["m00"] > 0:
-                cx = int(M["m10"] / M["m00"])
-                cy = int(M["m01"] / M["m00"])
-                return (cx, cy)
+    def detect_yellow_dot(self, minimap):
+        return self._yellow_dot_from_analysis(minimap_analyzer.analyze(minimap))
+    
+    def _yellow_dot_from_analysis(self, analysis):
+        if analysis is None:
+            return None
         
+        dots = analysis.dots.get("yellow")
+        if dots and dots[0].x is not None:
+            return (dots[0].x, dots[0].y)
         return None
     
-    def _get_zone_at_position(self, x, y):
-        scroll_offset = {"x": 0, "y": 0}
-        if self.scroll_tracker:
+    def query_region(self, x, y):
+        scroll_x_640 = 0.0
+        scroll_y_640 = 0.0
+        if self.scroll_tracker and self.scroll_tracker.scroll_enabled:
             scroll_offset = self.scroll_tracker.get_current_scroll_offset()
+            scroll_x_640 = scroll_offset.get("x", 0) * self.scale_to_640
+            scroll_y_640 = scroll_offset.get("y", 0) * self.scale_to_640
         
-        for zone in self.zones:
-            bbox = zone.get("bbox_640", [])
-            if len(bbox) == 4:
-                x1, y1, x2, y2 = bbox
-                
-                scroll_x_640 = scroll_offset.get("x", 0) * self.scale_to_640
-                scroll_y_640 = scroll_offset.get("y", 0) * self.scale_to_640
-                
-                ox1 = int(x1 + scroll_x_640)
-                oy1 = int(y1 + scroll_y_640)
-                ox2 = int(x2 + scroll_x_640)
-                oy2 = int(y2 + scroll_y_640)
-                
-                if ox1 <= x <= ox2 and oy1 <= y <= oy2:
-                    return zone["id"]
-        return None
\ No newline at end of file
+        return self.region_map.query(x, y, scroll_x_640, scroll_y_640)
\ No newline at end of file